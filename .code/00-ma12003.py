@@ -4,9 +4,298 @@ import sys
 import os
 sys.path.insert(0,os.path.expanduser('~')+"/ma12003/.code/")
 
-# Make pytest available
-import pytest
+import importlib.util
 
-def run_tests():
-    """Run pytest on all tests in the current notebook"""
-    pytest.main(args=["-v","--tb=short","--color=yes","--timeout=5","-W ignore::DeprecationWarning"])
\ No newline at end of file
+
+def _lazy_import(name):
+    """Import a module lazily: it is only loaded when one of its attributes is used"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError("No module named " + repr(name))
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Make pytest available; it is only loaded when it is first used, since
+# importing it takes longer than the rest of the kernel startup
+pytest = _lazy_import("pytest")
+
+# Only needed by run_tests()
+ast = _lazy_import("ast")
+hashlib = _lazy_import("hashlib")
+json = _lazy_import("json")
+import time
+
+_PYTEST_ARGS = ["-v","--tb=short","--color=yes","--timeout=5","-W ignore::DeprecationWarning"]
+
+# Results of previous runs for run_tests(incremental=True), in the current directory
+_CACHE_FILE = ".ma12003_test_cache.json"
+
+# pytest plugin recording outcome and duration of every test. It is used in
+# this kernel and, written to a temporary module, in worker processes.
+_RESULTS_PLUGIN = '''
+import json
+import os
+
+class ResultsPlugin:
+    def __init__(self):
+        self.results = {}
+
+    def pytest_runtest_logreport(self, report):
+        r = self.results.setdefault(report.nodeid, {"outcome": "passed", "duration": 0.0})
+        r["duration"] += report.duration
+        if report.failed:
+            r["outcome"] = "failed"
+        elif report.skipped and r["outcome"] == "passed":
+            r["outcome"] = "skipped"
+
+    def pytest_sessionfinish(self, session):
+        path = os.environ.get("MA12003_RESULTS")
+        if path:
+            with open(path, "w") as f:
+                json.dump(self.results, f)
+
+plugin = ResultsPlugin()
+
+# Hooks are only looked up at module level when this module is loaded with
+# "pytest -p", so register the instance from here
+def pytest_configure(config):
+    config.pluginmanager.register(plugin)
+'''
+
+
+class _Collector:
+    """pytest plugin recording node id, file and function of every collected test"""
+
+    def __init__(self):
+        self.items = []
+        self.rootdir = None
+
+    def pytest_collection_modifyitems(self, config, items):
+        self.rootdir = str(config.rootpath)
+        for item in items:
+            name = getattr(item, "originalname", None) or item.name
+            cls = item.cls.__name__ if getattr(item, "cls", None) else None
+            self.items.append((item.nodeid, str(item.path), cls, name))
+
+
+def _new_results_plugin():
+    namespace = {}
+    exec(_RESULTS_PLUGIN, namespace)
+    return namespace["plugin"]
+
+
+def _local_imports(tree, directory):
+    """Paths of the modules in directory which are imported in the syntax tree"""
+    paths = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and (node.level == 0):
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            module = os.path.join(directory, *name.split(".")) + ".py"
+            if os.path.isfile(module):
+                paths.append(module)
+    return paths
+
+
+def _file_hash(path, seen):
+    """Hash of a source file and (recursively) of the local modules it imports"""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+        tree = ast.parse(source)
+    except (OSError, SyntaxError):
+        return h.hexdigest()
+    h.update(source)
+    for module in _local_imports(tree, os.path.dirname(path)):
+        if module not in seen:
+            seen.add(module)
+            h.update(_file_hash(module, seen).encode())
+    return h.hexdigest()
+
+
+def _is_test(node):
+    return (isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test")) \
+        or (isinstance(node, ast.ClassDef) and node.name.startswith("Test"))
+
+
+def _conftest_files(path, rootdir):
+    """conftest.py files which apply to the test file path, up to rootdir"""
+    files = []
+    directory = os.path.dirname(os.path.abspath(path))
+    rootdir = os.path.abspath(rootdir) if rootdir else None
+    while True:
+        conftest = os.path.join(directory, "conftest.py")
+        if os.path.isfile(conftest):
+            files.append(conftest)
+        parent = os.path.dirname(directory)
+        if directory == rootdir or parent == directory:
+            return files
+        directory = parent
+
+
+def _test_hash(path, cls, name, parsed, rootdir=None):
+    """Hash of the source of one test, of the shared (non-test) code in its file
+    and its class, of the conftest.py files that apply to it and of the local
+    modules imported by its file"""
+    if path not in parsed:
+        try:
+            with open(path, "r") as f:
+                source = f.read()
+            tree = ast.parse(source)
+        except (OSError, SyntaxError):
+            source, tree = "", ast.Module(body=[], type_ignores=[])
+        context = hashlib.sha256()
+        for node in tree.body:
+            if not _is_test(node):
+                context.update((ast.get_source_segment(source, node) or "").encode())
+        for module in _local_imports(tree, os.path.dirname(path)):
+            context.update(_file_hash(module, {path, module}).encode())
+        for conftest in _conftest_files(path, rootdir):
+            context.update(_file_hash(conftest, {path, conftest}).encode())
+        parsed[path] = (source, tree, context.hexdigest())
+    source, tree, context = parsed[path]
+    h = hashlib.sha256(context.encode())
+    body = tree.body
+    if cls is not None:
+        body = [n for n in body if isinstance(n, ast.ClassDef) and n.name == cls]
+        body = body[0].body if body else []
+        # fixtures, helper methods and attributes of the class
+        for node in body:
+            if not _is_test(node):
+                h.update((ast.get_source_segment(source, node) or "").encode())
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
+            h.update((ast.get_source_segment(source, node) or "").encode())
+    return h.hexdigest()
+
+
+def _run_in_workers(nodeids, workers):
+    """Run the given tests in worker processes and return their results"""
+    import subprocess
+    import tempfile
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "ma12003_results.py"), "w") as f:
+            f.write(_RESULTS_PLUGIN)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = tmp + os.pathsep + env.get("PYTHONPATH", "")
+        procs = []
+        for k in range(workers):
+            chunk = nodeids[k::workers]
+            if len(chunk) == 0:
+                continue
+            env_k = dict(env, MA12003_RESULTS=os.path.join(tmp, "results_%d.json" % k))
+            procs.append((subprocess.Popen(
+                [sys.executable, "-m", "pytest", "-p", "ma12003_results", "-q",
+                 "--tb=short", "--timeout=5", "-W", "ignore::DeprecationWarning", *chunk],
+                env=env_k, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True),
+                env_k["MA12003_RESULTS"]))
+        for proc, path in procs:
+            output, _ = proc.communicate()
+            print(output)
+            if os.path.exists(path):
+                with open(path) as f:
+                    results.update(json.load(f))
+    return results
+
+
+def _print_timings(results, cached):
+    """Print a table of all tests, slowest first"""
+    print("\n%-60s %-17s %10s" % ("test", "outcome", "time [s]"))
+    for nodeid, r in sorted(results.items(), key=lambda kv: -kv[1]["duration"]):
+        label = r["outcome"] + (" (cached)" if nodeid in cached else "")
+        print("%-60s %-17s %10.4f" % (nodeid, label, r["duration"]))
+
+
+def run_tests(incremental=False, workers=1):
+    """Run pytest on all tests in the current notebook
+
+    incremental: only run tests whose source, or the source of a local module
+        imported by their test file, changed since the last run; the results
+        of all other tests are taken from the cache file .ma12003_test_cache.json
+    workers: number of worker processes the tests are distributed over
+
+    A table with the time taken by every test is printed at the end.
+    """
+    if not incremental and workers <= 1:
+        plugin = _new_results_plugin()
+        pytest.main(args=_PYTEST_ARGS, plugins=[plugin])
+        _print_timings(plugin.results, set())
+        return
+
+    collector = _Collector()
+    pytest.main(args=["--collect-only", "-q", "-W ignore::DeprecationWarning"], plugins=[collector])
+    parsed = {}
+    hashes = {nodeid: _test_hash(path, cls, name, parsed, collector.rootdir)
+              for nodeid, path, cls, name in collector.items}
+
+    cache = {}
+    if incremental and os.path.exists(_CACHE_FILE):
+        with open(_CACHE_FILE) as f:
+            cache = json.load(f)
+    cached = {nodeid for nodeid, h in hashes.items()
+              if (nodeid in cache) and (cache[nodeid]["hash"] == h)}
+    to_run = [nodeid for nodeid in hashes if nodeid not in cached]
+
+    start = time.perf_counter()
+    if len(to_run) == 0:
+        results = {}
+    elif workers > 1:
+        results = _run_in_workers(to_run, workers)
+    else:
+        plugin = _new_results_plugin()
+        pytest.main(args=_PYTEST_ARGS + to_run, plugins=[plugin])
+        results = plugin.results
+    print("ran %d tests in %.2f s, reused %d cached results"
+          % (len(to_run), time.perf_counter() - start, len(cached)))
+
+    for nodeid in cached:
+        results[nodeid] = {"outcome": cache[nodeid]["outcome"], "duration": cache[nodeid]["duration"]}
+    new_cache = {nodeid: dict(results[nodeid], hash=hashes[nodeid])
+                 for nodeid in hashes if nodeid in results}
+    with open(_CACHE_FILE, "w") as f:
+        json.dump(new_cache, f, indent=1)
+    _print_timings(results, cached)
+
+
+def import_time_report(code="import model_solutions", top=15):
+    """Print the slowest imports when running code in a fresh Python interpreter
+
+    The import times are measured with python -X importtime.
+
+    input:
+      * code to run, e.g. "import model_solutions"
+      * top = number of imports to print
+    output:
+      * total import time in seconds
+      * list of (cumulative time in seconds, module name) for all imports,
+        slowest first
+    """
+    import subprocess
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True)
+    imports = []
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        imports.append((int(cumulative_us) / 1e6, name.strip()))
+    imports.sort(reverse=True)
+    print("total import time %.3f s for %r" % (total / 1e6, code))
+    for cumulative, name in imports[:top]:
+        print("%10.4f s  %s" % (cumulative, name))
+    return total / 1e6, imports
@@ -0,0 +1,85 @@
+'''Tests for run_tests() in the bootstrap file'''
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BOOTSTRAP = os.path.join(HERE, '00-ma12003.py')
+
+TESTS = '''
+import pytest
+
+@pytest.fixture
+def value():
+    return 2
+
+def test_one():
+    assert 1 + 1 == 2
+
+def test_two():
+    assert 2 * 2 == 4
+
+class TestClass:
+    def helper(self):
+        return 3
+
+    def test_three(self):
+        assert self.helper() == 3
+
+    def test_four(self, value):
+        assert value == 2
+'''
+
+
+def _bootstrap():
+    '''Execute the bootstrap file and return its namespace'''
+    namespace = {'__name__': 'bootstrap'}
+    with open(BOOTSTRAP) as f:
+        exec(compile(f.read(), BOOTSTRAP, 'exec'), namespace)
+    return namespace
+
+
+def _write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_workers_report_every_test(tmp_path, monkeypatch):
+    '''Check that the worker processes return one result per node id'''
+    _write(tmp_path / 'test_sample.py', TESTS)
+    monkeypatch.chdir(tmp_path)
+    nodeids = ['test_sample.py::test_one', 'test_sample.py::test_two',
+               'test_sample.py::TestClass::test_three', 'test_sample.py::TestClass::test_four']
+    results = _bootstrap()['_run_in_workers'](nodeids, 2)
+    assert sorted(results) == sorted(nodeids)
+    assert all(r['outcome'] == 'passed' for r in results.values())
+
+
+def test_hash_depends_on_conftest_and_class(tmp_path):
+    '''Check that a test's hash changes with conftest.py and the helpers of its
+    class, but not with other tests'''
+    test_hash = _bootstrap()['_test_hash']
+    path = str(tmp_path / 'tests' / 'test_sample.py')
+    os.mkdir(tmp_path / 'tests')
+    _write(path, TESTS)
+    _write(tmp_path / 'conftest.py', 'X = 1\n')
+
+    def current():
+        return test_hash(path, 'TestClass', 'test_three', {}, str(tmp_path))
+
+    h = current()
+    _write(tmp_path / 'conftest.py', 'X = 2\n')
+    assert current() != h
+    h = current()
+    _write(path, TESTS.replace('return 3', 'return 4'))
+    assert current() != h
+    h = current()
+    _write(path, TESTS.replace('return 3', 'return 4').replace('2 * 2 == 4', '2 * 2 == 5'))
+    assert current() == h
+
+
+def test_timing_table_aligned(capsys):
+    '''Check that the time column of the header is aligned with the numbers'''
+    _bootstrap()['_print_timings']({'test_a.py::test_one': {'outcome': 'passed', 'duration': 0.25}},
+                                   {'test_a.py::test_one'})
+    header, row = capsys.readouterr().out.strip('\n').split('\n')
+    assert len(header) == len(row)
+    assert header.index('outcome') == row.index('passed')
@@ -0,0 +1,41 @@
+'''Regression tests for the startup time of MA12003 kernels'''
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BOOTSTRAP = os.path.join(HERE, '00-ma12003.py')
+MODEL_SOLUTIONS_DIR = os.path.join(HERE, '..', 'week01')
+
+# Maximal import time (in seconds) added by running the bootstrap file
+IMPORT_TIME_BUDGET = 0.05
+
+
+def _bootstrap():
+    '''Execute the bootstrap file and return its namespace'''
+    namespace = {'__name__': 'bootstrap'}
+    with open(BOOTSTRAP) as f:
+        exec(compile(f.read(), BOOTSTRAP, 'exec'), namespace)
+    return namespace
+
+
+def _added_imports(code):
+    '''Import time and names of the modules imported by code in a fresh interpreter'''
+    report = _bootstrap()['import_time_report']
+    base_total, base_imports = report('pass')
+    total, imports = report(code)
+    base_names = set(name for _, name in base_imports)
+    return total - base_total, set(name for _, name in imports) - base_names
+
+
+def test_bootstrap_import_time():
+    '''Check that the bootstrap file stays within its import time budget'''
+    code = 'exec(compile(open(%r).read(), %r, "exec"))' % (BOOTSTRAP, BOOTSTRAP)
+    seconds, names = _added_imports(code)
+    assert 'pytest' not in names
+    assert seconds < IMPORT_TIME_BUDGET
+
+
+def test_model_solutions_lazy_numpy():
+    '''Check that importing model_solutions does not import numpy'''
+    code = 'import sys; sys.path.insert(0, %r); import model_solutions' % MODEL_SOLUTIONS_DIR
+    seconds, names = _added_imports(code)
+    assert 'numpy' not in names
@@ -0,0 +1,49 @@
+"""
+Benchmark of model_solutions.parallel_sort against the single-process
+model_solutions.merge_sort for growing input sizes and numbers of workers.
+
+Run with
+
+python benchmark_parallel_sort.py
+"""
+
+import os
+import time
+
+import numpy as np
+
+import model_solutions
+
+
+def best_time(f, a, repeat=3):
+    """Smallest run time of f on a fresh copy of a over several repeats"""
+    times = []
+    for r in range(repeat):
+        b = a.copy()
+        t = time.perf_counter()
+        f(b)
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def run(sizes=(10**5, 10**6, 10**7), max_workers=None):
+    """Print run times and speedups relative to merge_sort"""
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    workers = [w for w in (2, 4, 8, 16, 32, 64) if w <= max_workers] or [1]
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        a = rng.random(n)
+        lst = a.tolist()
+        t_list = best_time(model_solutions.merge_sort, lst, repeat=1)
+        t_array = best_time(model_solutions.merge_sort, a)
+        print(f"n = {n}: merge_sort list {t_list:.3f} s, array {t_array:.3f} s")
+        for w in workers:
+            t_par_list = best_time(lambda b: model_solutions.parallel_sort(b, w), lst, repeat=1)
+            t_par = best_time(lambda b: model_solutions.parallel_sort(b, w), a)
+            print(f"  {w:3d} workers: list {t_par_list:.3f} s (speedup {t_list / t_par_list:.2f}),"
+                  f" array {t_par:.3f} s (speedup {t_array / t_par:.2f})")
+
+
+if __name__ == "__main__":
+    run()
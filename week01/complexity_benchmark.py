@@ -0,0 +1,197 @@
+"""
+*** benchmark harness with empirical complexity fitting ***
+
+Every benchmark runs one function from model_solutions over a geometric series
+of input sizes n. From the measured run times t(n) it fits
+
+  * the scaling exponent k of t(n) ~ C n^k (least squares fit of log t against
+    log n), the exponent k of t(n) ~ C n^k log n for algorithms such as merge
+    sort, or the base b of t(n) ~ C b^n for exponential algorithms, and
+  * the constant factor C = median of t(n) / f(n), where f is the expected
+    complexity class, e.g. f(n) = n^2 for insertion_sort.
+
+The results are written to JSON. A run fails (exit code 1) if the fitted
+exponent differs from the expected one by more than its tolerance, or if the
+exponent or the constant factor regress against a stored baseline.
+
+Usage:
+
+python complexity_benchmark.py --output results.json
+python complexity_benchmark.py --baseline baseline.json
+python complexity_benchmark.py --baseline baseline.json --update-baseline
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import timeit
+
+import numpy as np
+
+import model_solutions
+
+
+class Benchmark(object):
+    """A function, its inputs and its expected complexity class"""
+
+    def __init__(self, name, make_input, run, sizes, complexity, expected, tolerance):
+        """
+        input:
+          * name of the benchmark
+          * make_input(n) = input of size n (not timed)
+          * run(input) = call of the benchmarked function
+          * sizes = list of input sizes n
+          * complexity = 'power' for t ~ C n^k, 'nlogn' for t ~ C n^k log n
+            (with expected k = 1), 'exp' for t ~ C b^n
+          * expected = expected exponent k (or base b for 'exp')
+          * tolerance = allowed deviation of the fitted exponent (or base)
+        """
+        self.name = name
+        self.make_input = make_input
+        self.run = run
+        self.sizes = sizes
+        self.complexity = complexity
+        self.expected = expected
+        self.tolerance = tolerance
+
+    def model(self, n):
+        """Expected growth f(n) used for the constant factor C = t(n)/f(n)"""
+        if self.complexity == "exp":
+            return self.expected**n
+        elif self.complexity == "nlogn":
+            return n**self.expected * math.log2(n)
+        elif self.expected == 0:
+            return math.log2(n)
+        return n**self.expected
+
+
+def geometric_sizes(n_min, n_max, count):
+    """count integers spaced geometrically between n_min and n_max"""
+    return sorted(set(int(round(n)) for n in np.geomspace(n_min, n_max, count)))
+
+
+def _random_list(n):
+    rng = random.Random(n)
+    return [rng.random() for k in range(n)]
+
+
+def _search_input(n):
+    rng = random.Random(n)
+    return list(range(n)), [rng.randrange(n) for k in range(100)]
+
+
+BENCHMARKS = [
+    # O(log n) multiplications; a float base keeps each multiplication O(1).
+    # A logarithm shows up as a fitted exponent close to 0.
+    Benchmark("fast_power", lambda n: n, lambda n: model_solutions.fast_power(1.0000001, n),
+              geometric_sizes(2**4, 2**40, 8), "power", 0, 0.25),
+    Benchmark("fib_rec", lambda n: n, model_solutions.fib_rec,
+              list(range(12, 23, 2)), "exp", (1 + math.sqrt(5)) / 2, 0.15),
+    Benchmark("fib_iter", lambda n: n, model_solutions.fib_iter,
+              geometric_sizes(2**6, 2**12, 7), "power", 1, 0.35),
+    Benchmark("binary_search", _search_input,
+              lambda a: [model_solutions.binary_search(a[0], x) for x in a[1]],
+              geometric_sizes(2**6, 2**18, 7), "power", 0, 0.25),
+    Benchmark("insertion_sort", _random_list, model_solutions.insertion_sort,
+              geometric_sizes(2**6, 2**11, 6), "power", 2, 0.3),
+    Benchmark("merge_sort", _random_list, model_solutions.merge_sort,
+              geometric_sizes(2**8, 2**15, 6), "nlogn", 1, 0.2),
+]
+
+
+def measure(benchmark, repeat=5):
+    """Time benchmark.run for every size, return the list of times in seconds"""
+    times = []
+    for n in benchmark.sizes:
+        data = benchmark.make_input(n)
+        timer = timeit.Timer(lambda: benchmark.run(data))
+        number, _ = timer.autorange()
+        times.append(min(timer.repeat(repeat=repeat, number=number)) / number)
+    return times
+
+
+def fit(benchmark, times):
+    """Fit exponent (or base) and constant factor to the measured times"""
+    n = np.array(benchmark.sizes, dtype=float)
+    t = np.array(times)
+    if benchmark.complexity == "exp":
+        slope, _ = np.polyfit(n, np.log(t), 1)
+        exponent = math.exp(slope)
+    elif benchmark.complexity == "nlogn":
+        # t / log n ~ C n^k
+        exponent, _ = np.polyfit(np.log(n), np.log(t / np.log2(n)), 1)
+    else:
+        exponent, _ = np.polyfit(np.log(n), np.log(t), 1)
+    constant = float(np.median(t / np.array([benchmark.model(k) for k in benchmark.sizes])))
+    return float(exponent), constant
+
+
+def run(benchmarks=BENCHMARKS, repeat=5):
+    """Run all benchmarks and return the results as a dictionary"""
+    results = {}
+    for b in benchmarks:
+        times = measure(b, repeat)
+        exponent, constant = fit(b, times)
+        results[b.name] = {"sizes": b.sizes, "times": times, "complexity": b.complexity,
+                           "exponent": exponent, "expected": b.expected, "constant": constant}
+        print("%-16s exponent %7.3f (expected %.3f)  constant %.3e"
+              % (b.name, exponent, b.expected, constant))
+    return results
+
+
+def check(results, benchmarks=BENCHMARKS, baseline=None, constant_tolerance=1.5):
+    """Return a list of messages for every complexity or constant factor regression
+
+    constant_tolerance = allowed ratio of the constant factor to the baseline
+    """
+    problems = []
+    for b in benchmarks:
+        r = results[b.name]
+        if abs(r["exponent"] - b.expected) > b.tolerance:
+            problems.append("%s: exponent %.3f differs from expected %.3f"
+                            % (b.name, r["exponent"], b.expected))
+        if (baseline is None) or (b.name not in baseline):
+            continue
+        base = baseline[b.name]
+        if r["exponent"] > base["exponent"] + b.tolerance:
+            problems.append("%s: exponent %.3f regressed from baseline %.3f"
+                            % (b.name, r["exponent"], base["exponent"]))
+        if r["constant"] > constant_tolerance * base["constant"]:
+            problems.append("%s: constant factor %.3e regressed from baseline %.3e"
+                            % (b.name, r["constant"], base["constant"]))
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model_solutions and fit complexities")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against (or update) this JSON file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--only", nargs="*", help="names of the benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    benchmarks = [b for b in BENCHMARKS if (not args.only) or (b.name in args.only)]
+    results = run(benchmarks, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1)
+        return 0
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    problems = check(results, benchmarks, baseline)
+    for p in problems:
+        print("REGRESSION: " + p)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+*** external merge sort for CSV files ***
+
+model_solutions.merge_sort() needs the whole list in memory. For CSV files
+which are larger than the available memory, external_sort() works in two
+phases:
+
+1. The input is read in chunks of at most memory_limit bytes (approximately,
+   measured as the length of the text of the rows). Each chunk is sorted with
+   model_solutions.merge_sort() and written to a temporary run file.
+2. The sorted run files are merged with a heap-based k-way merge
+   (heapq.merge) and the result is streamed to an output file or returned
+   as a generator.
+
+Example: sort the climate data by anomaly
+
+import external_sort
+external_sort.external_sort("climate_data.csv", "Anomaly (deg C)",
+                            output="climate_data_sorted.csv")
+"""
+
+import csv
+import heapq
+import os
+import shutil
+import tempfile
+
+import model_solutions
+
+
+def external_sort(
+    path,
+    key_column=0,
+    output=None,
+    memory_limit=64 * 2**20,
+    run_dir=None,
+    key_type=float,
+    reverse=False,
+    header=True,
+    buffer_size=2**20,
+):
+    """Sort the rows of a CSV file by one column with bounded memory
+
+    input:
+      * path of the CSV file
+      * key_column = index or (if header is True) name of the column to sort by
+      * output = path of the output CSV file, or None to return a generator
+      * memory_limit = approximate number of bytes of rows held in memory
+      * run_dir = directory for the temporary run files (default: system temp)
+      * key_type = function converting the key column, e.g. float or str
+      * reverse = sort in descending order if True
+      * header = True if the first row of the file is a header row
+      * buffer_size = size of the read and write buffers in bytes
+    output:
+      * None if output is given; the sorted file (with header row) is written
+      * otherwise a generator of the sorted data rows (lists of strings); the
+        input is only read and the run files are only written once iteration
+        starts, and the run files are removed when the generator is exhausted
+        or closed
+
+    The sort is stable: rows with equal keys keep their order from the input.
+    """
+    head = None
+    if header:
+        with open(path, newline="", buffering=buffer_size) as f:
+            head = next(csv.reader(f), None)
+    if isinstance(key_column, str):
+        if head is None:
+            raise Exception("Column names can only be used for files with a header row.")
+        key_column = head.index(key_column)
+
+    def key(row):
+        return key_type(row[key_column])
+
+    rows = _sorted_rows(path, header, key, reverse, memory_limit, run_dir, buffer_size)
+    if output is None:
+        return rows
+    try:
+        with open(output, "w", newline="", buffering=buffer_size) as f:
+            writer = csv.writer(f)
+            if head is not None:
+                writer.writerow(head)
+            writer.writerows(rows)
+    finally:
+        rows.close()
+
+
+def _sorted_rows(path, header, key, reverse, memory_limit, run_dir, buffer_size):
+    """Generator of the sorted data rows
+
+    The run files are only written once iteration starts, and they are removed
+    when the generator is exhausted or closed (e.g. when it is garbage
+    collected), so that an unused generator leaves no files behind.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="external_sort_", dir=run_dir)
+    try:
+        with open(path, newline="", buffering=buffer_size) as f:
+            reader = csv.reader(f)
+            if header:
+                next(reader, None)
+            runs = _write_runs(reader, key, reverse, memory_limit, tmp_dir, buffer_size)
+        yield from _merge_runs(runs, key, reverse, buffer_size)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _write_runs(reader, key, reverse, memory_limit, tmp_dir, buffer_size):
+    """Split the rows into sorted run files of at most memory_limit bytes"""
+    runs = []
+    chunk = []
+    size = 0
+    for row in reader:
+        chunk.append(row)
+        size += sum(map(len, row)) + len(row)
+        if size >= memory_limit:
+            runs.append(_write_run(chunk, key, reverse, tmp_dir, len(runs), buffer_size))
+            chunk = []
+            size = 0
+    if len(chunk) > 0:
+        runs.append(_write_run(chunk, key, reverse, tmp_dir, len(runs), buffer_size))
+    return runs
+
+
+def _write_run(chunk, key, reverse, tmp_dir, number, buffer_size):
+    """Sort one chunk in memory and write it to a run file"""
+    run = os.path.join(tmp_dir, "run_%06d.csv" % number)
+    with open(run, "w", newline="", buffering=buffer_size) as f:
+        csv.writer(f).writerows(model_solutions.merge_sort(chunk, key=key, reverse=reverse))
+    return run
+
+
+def _merge_runs(runs, key, reverse, buffer_size):
+    """Generator for the k-way merge of all run files"""
+    files = []
+    try:
+        for run in runs:
+            files.append(open(run, newline="", buffering=buffer_size))
+        readers = [csv.reader(f) for f in files]
+        yield from heapq.merge(*readers, key=key, reverse=reverse)
+    finally:
+        for f in files:
+            f.close()
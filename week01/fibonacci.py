@@ -0,0 +1,153 @@
+"""
+*** exact Fibonacci numbers ***
+
+The Fibonacci numbers F_0 = 0, F_1 = 1, F_n = F_{n-1} + F_{n-2} are computed
+exactly with Python integers by the fast doubling method
+
+F_{2k}   = F_k * (2 F_{k+1} - F_k)
+F_{2k+1} = F_k^2 + F_{k+1}^2
+
+which needs O(log n) big integer multiplications. Unlike
+model_solutions.fib_rec_fast_mat(), which uses int64 matrices and overflows
+above F_92, the results are exact for all n.
+
+Recently computed pairs (F_n, F_{n+1}) are kept in a bounded memo, so that
+repeated queries are free and queries close to a previous one only need a few
+additions.
+"""
+
+import collections
+
+# Maximal number of pairs (F_n, F_{n+1}) kept in the memo
+MEMO_SIZE = 128
+
+# Queries at most this far away from a memoised index are answered by stepping
+NEARBY = 32
+
+_memo = collections.OrderedDict()
+
+
+def _check_index(n):
+    if not (n == int(n)):
+        raise Exception("Fibonacci number F_n not defined for non-integer values")
+    elif n < 0:
+        raise Exception("Fibonacci number F_n not defined for negative values")
+    return int(n)
+
+
+def _remember(n, pair):
+    _memo[n] = pair
+    _memo.move_to_end(n)
+    if len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+
+
+def _step(m, pair, n):
+    """Step from (F_m, F_{m+1}) to (F_n, F_{n+1}) by repeated additions"""
+    a, b = pair
+    while m < n:
+        a, b = b, a + b
+        m += 1
+    while m > n:
+        a, b = b - a, a
+        m -= 1
+    return a, b
+
+
+def _double(pair, bits):
+    """Apply fast doubling to (F_k, F_{k+1}) for each of the given bits"""
+    a, b = pair
+    for bit in bits:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fib_pair(n):
+    """Compute the pair (F_n, F_{n+1})
+
+    input: Number n >= 0
+    output: tuple (F_n, F_{n+1})
+    """
+    n = _check_index(n)
+    if n in _memo:
+        _memo.move_to_end(n)
+        return _memo[n]
+    nearest = min(_memo, key=lambda m: abs(n - m), default=None)
+    if (nearest is not None) and abs(n - nearest) <= NEARBY:
+        pair = _step(nearest, _memo[nearest], n)
+    else:
+        # the binary digits of n>>s are a prefix of those of n, so we can
+        # continue doubling from any memoised n>>s
+        bits = bin(n)[2:]
+        start = 0
+        pair = (0, 1)
+        for s in range(1, len(bits)):
+            if (n >> s) in _memo:
+                start = len(bits) - s
+                pair = _memo[n >> s]
+                break
+        pair = _double(pair, bits[start:])
+    _remember(n, pair)
+    return pair
+
+
+def fib(n):
+    """Compute n-th Fibonacci number exactly
+
+    input: Number n >= 0
+    output: n-th Fibonacci number F_n
+    """
+    return fib_pair(n)[0]
+
+
+def fib_many(ns):
+    """Compute the Fibonacci numbers F_n for all n in a list of indices
+
+    The indices are processed in increasing order, so that each query can start
+    from the result of the previous one: small gaps are bridged by additions,
+    large gaps by fast doubling.
+
+    input: list of numbers ns = [n_0, n_1, ...]
+    output: list [F_{n_0}, F_{n_1}, ...]
+    """
+    ns = [_check_index(n) for n in ns]
+    values = {}
+    previous = None
+    for n in sorted(set(ns)):
+        if (previous is not None) and (n - previous[0] <= max(NEARBY, n.bit_length())):
+            pair = _step(previous[0], previous[1], n)
+            _remember(n, pair)
+        else:
+            pair = fib_pair(n)
+        values[n] = pair[0]
+        previous = (n, pair)
+    return [values[n] for n in ns]
+
+
+def fib_mod(n, m):
+    """Compute F_n mod m by fast doubling modulo m
+
+    All intermediate values are reduced modulo m, so n can be huge.
+
+    input:
+      * number n >= 0
+      * modulus m >= 1
+    output: F_n mod m
+    """
+    n = _check_index(n)
+    if m < 1:
+        raise Exception("Modulus must be a positive integer")
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        if bit == "1":
+            a, b = d, (c + d) % m
+        else:
+            a, b = c, d
+    return a
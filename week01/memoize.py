@@ -0,0 +1,259 @@
+"""
+*** persistent memoization for pure functions ***
+
+The decorator memoize() remembers the results of a pure function in two tiers:
+
+  * an in-memory LRU cache of at most maxsize results, and
+  * an on-disk cache shared by all kernels, so that e.g. fib_rec(35) is
+    computed once and not again in every new kernel.
+
+Disk entries are keyed by the identity of the function (module, name and a
+hash of its byte code, so that editing the function invalidates its entries)
+and a stable hash of the arguments. NumPy arrays are hashed by dtype, shape
+and buffer. Entries are written atomically (to a temporary file which is then
+renamed), so several kernels can use the same cache directory at once. The
+disk cache is limited to max_disk_bytes per function; the least recently used
+entries are removed first. Entries older than ttl seconds are ignored.
+
+Example:
+
+import model_solutions
+from memoize import memoize
+
+# replacing the module attribute also memoizes the recursive calls
+model_solutions.fib_rec = memoize()(model_solutions.fib_rec)
+model_solutions.fib_rec(35)
+print(model_solutions.fib_rec.cache_info())
+"""
+
+import collections
+import copy
+import functools
+import hashlib
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ma12003_memoize")
+
+
+def _update_hash(h, x):
+    """Feed a stable, type-tagged encoding of x into the hash h"""
+    np = sys.modules.get("numpy")
+    if x is None or isinstance(x, bool):
+        h.update(b"c" + repr(x).encode())
+    elif isinstance(x, int):
+        h.update(b"i" + str(x).encode() + b";")
+    elif isinstance(x, float):
+        h.update(b"f" + struct.pack("<d", x))
+    elif isinstance(x, complex):
+        h.update(b"z" + struct.pack("<dd", x.real, x.imag))
+    elif isinstance(x, str):
+        data = x.encode()
+        h.update(b"s" + str(len(data)).encode() + b":" + data)
+    elif isinstance(x, bytes):
+        h.update(b"b" + str(len(x)).encode() + b":" + x)
+    elif isinstance(x, (tuple, list)):
+        h.update((b"t" if isinstance(x, tuple) else b"l") + str(len(x)).encode() + b"(")
+        for y in x:
+            _update_hash(h, y)
+        h.update(b")")
+    elif isinstance(x, (set, frozenset)):
+        h.update((b"S" if isinstance(x, frozenset) else b"e") + str(len(x)).encode() + b"{")
+        for k in sorted(_stable_hash(y) for y in x):
+            h.update(k.encode())
+        h.update(b"}")
+    elif isinstance(x, dict):
+        h.update(b"d" + str(len(x)).encode() + b"{")
+        items = [(_stable_hash(k), v) for k, v in x.items()]
+        for k, v in sorted(items, key=lambda kv: kv[0]):
+            h.update(k.encode())
+            _update_hash(h, v)
+        h.update(b"}")
+    elif (np is not None) and isinstance(x, np.ndarray):
+        h.update(b"a" + x.dtype.str.encode() + repr(x.shape).encode())
+        if x.dtype.hasobject:
+            _update_hash(h, x.tolist())
+        else:
+            h.update(memoryview(np.ascontiguousarray(x)).cast("B"))
+    elif (np is not None) and isinstance(x, np.generic):
+        _update_hash(h, np.asarray(x))
+    else:
+        h.update(b"p" + pickle.dumps(x, protocol=4))
+
+
+def _stable_hash(x):
+    h = hashlib.sha256()
+    _update_hash(h, x)
+    return h.hexdigest()
+
+
+def _update_code_hash(h, code):
+    """Feed the byte code, names and constants of a code object into the hash h
+
+    Nested code objects (of comprehensions, lambdas and inner functions) are
+    hashed recursively, since their repr contains a memory address which
+    differs between kernels.
+    """
+    h.update(b"C" + code.co_code)
+    _update_hash(h, code.co_names)
+    h.update(b"(")
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _update_code_hash(h, const)
+        else:
+            _update_hash(h, const)
+    h.update(b")")
+
+
+def _function_id(f):
+    """Module, name and a hash of the byte code and constants of f"""
+    code = getattr(f, "__code__", None)
+    h = hashlib.sha256()
+    if code is not None:
+        _update_code_hash(h, code)
+    return "%s.%s-%s" % (f.__module__, f.__qualname__, h.hexdigest()[:16])
+
+
+class _DiskCache(object):
+    """Directory of pickled (creation time, value) entries for one function"""
+
+    def __init__(self, directory, max_bytes, ttl):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        """Return (True, value) for a valid entry, (False, None) otherwise"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                created, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        if (self.ttl is not None) and (time.time() - created > self.ttl):
+            self._remove(path)
+            return False, None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return True, value
+
+    def put(self, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((time.time(), value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            self._remove(tmp)
+            raise
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the size limit is met"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            self._remove(entry.path)
+
+
+def memoize(maxsize=128, disk=True, cache_dir=None, max_disk_bytes=256 * 2**20,
+            ttl=None, copy_results=True):
+    """Decorator memoizing a pure function in memory and on disk
+
+    input:
+      * maxsize = number of results kept in memory (LRU)
+      * disk = use the on-disk tier if True
+      * cache_dir = directory of the disk tier (default ~/.cache/ma12003_memoize)
+      * max_disk_bytes = size limit of the disk tier for this function
+      * ttl = time to live of disk entries in seconds (None: no expiry)
+      * copy_results = return a copy of results from the memory tier, so that
+        modifying a returned list or array does not change the cache
+
+    The decorated function has the methods cache_info() and cache_clear().
+    """
+    def decorator(f):
+        memory = collections.OrderedDict()
+        lock = threading.Lock()
+        stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        store = None
+        if disk:
+            store = _DiskCache(os.path.join(cache_dir or DEFAULT_CACHE_DIR, _function_id(f)),
+                               max_disk_bytes, ttl)
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            key = _stable_hash((args, kwargs))
+            with lock:
+                if key in memory:
+                    memory.move_to_end(key)
+                    stats["memory_hits"] += 1
+                    value = memory[key]
+                    return copy.deepcopy(value) if copy_results else value
+            found = False
+            if store is not None:
+                found, value = store.get(key)
+            if found:
+                stats["disk_hits"] += 1
+            else:
+                stats["misses"] += 1
+                value = f(*args, **kwargs)
+                if store is not None:
+                    store.put(key, value)
+            with lock:
+                memory[key] = value
+                if len(memory) > maxsize:
+                    memory.popitem(last=False)
+            return copy.deepcopy(value) if copy_results else value
+
+        def cache_info():
+            """Hit and miss counts of the memory and disk tiers"""
+            calls = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            info = dict(stats, memory_size=len(memory), calls=calls)
+            info["hit_rate"] = (calls - stats["misses"]) / calls if calls else 0.0
+            return info
+
+        def cache_clear(disk=False):
+            """Clear the memory tier (and the disk tier if disk is True)"""
+            with lock:
+                memory.clear()
+            if disk and (store is not None):
+                store.clear()
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -1,5 +1,28 @@
-import numpy as np
 import collections
+import importlib.util
+import os
+import sys
+
+
+def _lazy_import(name):
+    """Import a module lazily: it is only loaded when one of its attributes is used"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError("No module named " + repr(name))
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# numpy and concurrent.futures are only loaded on first use, so that e.g.
+# insertion_sort or fib_iter can be used without paying for their import
+np = _lazy_import("numpy")
+futures = _lazy_import("concurrent.futures")
 
 """
 *** model solutions for MA12003 ***
@@ -63,6 +86,97 @@ def fast_power_mat(A, n):
         return A @ fast_power_mat(A @ A, (n - 1) // 2)
 
 
+##################################################################
+# matrix power for stacks of matrices, with modular and exact modes
+##################################################################
+
+# Largest value which can be stored in an int64 (np.iinfo(np.int64).max)
+_INT64_MAX = 2**63 - 1
+
+
+def _max_abs(A):
+    """Largest absolute value of the entries of an integer array
+
+    Computed from the minimum and maximum, since np.abs(-2**63) wraps around
+    in int64.
+    """
+    if A.size == 0:
+        return 0
+    return max(abs(int(np.min(A))), abs(int(np.max(A))))
+
+
+def _matmul_overflows(X, Y):
+    """Check whether the integer matrix product X @ Y could overflow an int64"""
+    return X.shape[-1] * _max_abs(X) * _max_abs(Y) > _INT64_MAX
+
+
+def power_mat(A, n, mod=None, exact=False):
+    """Compute matrix power A^n iteratively by repeated squaring
+
+    A can be a single matrix of shape (m, m) or a stack of matrices of shape
+    (k, m, m), in which case all k matrices are raised to the n-th power
+    simultaneously. The loop works on three preallocated buffers instead of
+    allocating new matrices at every step.
+
+    For integer matrices the following modes avoid silent int64 overflow:
+      * mod=p computes A^n mod p. This stays in int64 if (m * p^2) fits,
+        otherwise Python integers (dtype object) are used.
+      * exact=True switches to Python integers (dtype object) as soon as the
+        next product could overflow, so that the result is exact.
+
+    input:
+      * A matrix (or stack of matrices) to raise to the n-th power
+      * n power n
+      * mod optional modulus
+      * exact switch to exact integer arithmetic when needed
+    output:
+      A^n (or A^n mod p)
+    """
+    A = np.asarray(A)
+    if not (n == int(n)):
+        raise Exception("Can only raise matrix to integer powers.")
+    elif n < 0:
+        raise Exception("Can only raise matrix to non-negative powers.")
+    elif (A.ndim not in (2, 3)) or not (A.shape[-1] == A.shape[-2]):
+        raise Exception("Matrix must be square.")
+    n = int(n)
+    integer = (A.dtype == object) or np.issubdtype(A.dtype, np.integer)
+    if (mod is not None) or exact:
+        if not integer:
+            raise Exception("Modular and exact matrix powers need integer matrices.")
+        if (A.dtype != object) and (A.dtype != np.int64):
+            # unsigned entries beyond the int64 range would wrap around
+            A = A.astype(object if _max_abs(A) > _INT64_MAX else np.int64)
+    if mod is not None:
+        if A.shape[-1] * (mod - 1) ** 2 > _INT64_MAX:
+            A = A.astype(object)
+        A = A % mod
+    # R holds the result, B the current square A^(2^j), T is a work buffer
+    R = np.empty_like(A)
+    R[...] = np.identity(A.shape[-1], dtype=A.dtype)
+    if mod is not None:
+        R %= mod
+    B = A.copy()
+    T = np.empty_like(A)
+    while n > 0:
+        if n % 2 == 1:
+            if exact and (R.dtype != object) and _matmul_overflows(R, B):
+                R, B, T = R.astype(object), B.astype(object), T.astype(object)
+            np.matmul(R, B, out=T)
+            if mod is not None:
+                T %= mod
+            R, T = T, R
+        n = n // 2
+        if n > 0:
+            if exact and (B.dtype != object) and _matmul_overflows(B, B):
+                R, B, T = R.astype(object), B.astype(object), T.astype(object)
+            np.matmul(B, B, out=T)
+            if mod is not None:
+                T %= mod
+            B, T = T, B
+    return R
+
+
 ##################################################################
 # slow power method for matrices
 ##################################################################
@@ -215,22 +329,116 @@ def binary_search(a, x):
     returns:
       index j such that a_j = x or infinity if the list does not contain x
     """
-    n = len(a)
+    return _binary_search(a, x, 0, len(a))
+
+
+def _binary_search(a, x, lo, hi):
+    """Find x in the part a_lo,...,a_{hi-1} of the list a
+
+    Instead of slicing the list, only the bounds lo and hi are passed on to
+    the next level, so no elements are copied.
+    """
+    n = hi - lo
     if n == 0:
-        return np.infty
+        return np.inf
     elif n == 1:
-        if a[0] == x:
-            return 0
+        if a[lo] == x:
+            return lo
         else:
-            return np.infty
+            return np.inf
     else:
-        n_star = n // 2
+        n_star = lo + n // 2
         if x < a[n_star]:
-            a_star = a[:n_star]
-            return binary_search(a_star, x)
+            return _binary_search(a, x, lo, n_star)
         else:
-            a_star = a[n_star:]
-            return n_star + binary_search(a_star, x)
+            return _binary_search(a, x, n_star, hi)
+
+
+class SortedIndex(object):
+    """Sorted index over a list or array for vectorised search queries
+
+    The index is built once by sorting the values. Membership, position and
+    range queries are then answered for whole arrays of queries at once with
+    np.searchsorted. Inserted values are collected in a small sorted buffer
+    which is merged into the main array only once it has grown to about
+    sqrt(n) elements, so inserts do not require a full rebuild.
+    """
+
+    def __init__(self, a):
+        """Build the index over the values in the list or array a"""
+        self._main = np.sort(np.asarray(a))
+        self._buffer = self._main[:0]
+
+    def __len__(self):
+        return len(self._main) + len(self._buffer)
+
+    def values(self):
+        """Return all values in ascending order"""
+        self._merge()
+        return self._main
+
+    def insert(self, x):
+        """Insert a single value or an array of values into the index"""
+        # the values are not cast to the dtype of the index (e.g. 2.5 to 2):
+        # merging upcasts the index to np.result_type of both instead
+        x = np.sort(np.atleast_1d(np.asarray(x)))
+        self._buffer = _merge_sorted_arrays(self._buffer, x)
+        if len(self._buffer) ** 2 > len(self._main):
+            self._merge()
+
+    def _merge(self):
+        if len(self._buffer) > 0:
+            self._main = _merge_sorted_arrays(self._main, self._buffer)
+            self._buffer = self._main[:0]
+
+    def _count_less(self, x, side):
+        """Number of values < x (side='left') or <= x (side='right')"""
+        return (np.searchsorted(self._main, x, side=side)
+                + np.searchsorted(self._buffer, x, side=side))
+
+    def contains(self, x):
+        """Return boolean array: True where x is contained in the index"""
+        x = np.asarray(x)
+        return self._count_less(x, "right") > self._count_less(x, "left")
+
+    def position(self, x):
+        """Return the position of x in the sorted values or -1 if x is missing
+
+        For repeated values the first position is returned.
+        """
+        x = np.asarray(x)
+        left = self._count_less(x, "left")
+        right = self._count_less(x, "right")
+        return np.where(right > left, left, -1)
+
+    def count_range(self, lo, hi):
+        """Number of values v with lo <= v <= hi (vectorised in lo and hi)"""
+        return self._count_less(hi, "right") - self._count_less(lo, "left")
+
+    def range(self, lo, hi):
+        """Return the sorted array of all values v with lo <= v <= hi"""
+        values = self.values()
+        return values[np.searchsorted(values, lo, side="left"):
+                      np.searchsorted(values, hi, side="right")]
+
+
+def _merge_sorted_arrays(a, b):
+    """Merge two sorted NumPy arrays
+
+    The positions of the m values of b in a are found with np.searchsorted,
+    so merging takes O(m log n + n) time for n = len(a).
+    """
+    if len(a) == 0:
+        return b.copy()
+    elif len(b) == 0:
+        return a.copy()
+    positions = np.searchsorted(a, b, side="right") + np.arange(len(b))
+    c = np.empty(len(a) + len(b), dtype=np.result_type(a, b))
+    mask = np.ones(len(c), dtype=bool)
+    mask[positions] = False
+    c[positions] = b
+    c[mask] = a
+    return c
 
 
 ##################################################################
@@ -258,9 +466,330 @@ def insertion_sort(a):
     return b
 
 
+# Runs shorter than this are extended with insertion sort before merging
+# (8 was fastest for random floats in CPython, compared to 4, 16, 32 and 64)
+MERGE_SORT_CUTOFF = 8
+
+
 def merge(a1, a2):
     """Merge two sorted lists a1 and a2 and return merged list
 
+    The merge is stable: of two equal elements, the one from a1 comes first.
+
+    input:
+        a1 = first sorted list
+        a2 = second sorted list
+    output:
+        sorted list containing all elements from a1 and a2
+    """
+    a = []
+    i, j = 0, 0
+    n1, n2 = len(a1), len(a2)
+    while (i < n1) and (j < n2):
+        # Pick the smaller of the two elements
+        if a2[j] < a1[i]:
+            a.append(a2[j])
+            j += 1
+        else:
+            a.append(a1[i])
+            i += 1
+    a += a1[i:]
+    a += a2[j:]
+    return a
+
+
+def merge_sort(a, key=None, reverse=False):
+    """Sort a in ascending order with a stable bottom-up merge sort
+
+    Existing ascending (and strictly descending) runs in a are detected and
+    runs shorter than MERGE_SORT_CUTOFF are extended with insertion sort.
+    The runs are then merged pairwise, alternating between the list and a
+    single auxiliary buffer of the same length.
+
+    Lists (and other sequences) are not modified and a new sorted list is
+    returned. NumPy arrays are sorted in place and returned.
+
+    input:
+        a = unsorted list or NumPy array
+        key = optional function, elements are compared by key(x)
+        reverse = sort in descending order if True (stability is preserved)
+    output:
+        sorted list containing all elements from a
+    """
+    if isinstance(a, np.ndarray):
+        return _merge_sort_array(a, key, reverse)
+    vals = list(a)
+    if reverse:
+        vals.reverse()
+    if key is None:
+        keys = vals
+    else:
+        keys = [key(x) for x in vals]
+    result = _merge_sort_keys(keys, vals)
+    if reverse:
+        result.reverse()
+    return result
+
+
+def _merge_sort_array(a, key, reverse):
+    """Stable in-place sort of a NumPy array"""
+    # Sorting the reversed view ascending leaves a in stable descending order
+    b = a[::-1] if reverse else a
+    if key is None:
+        b.sort(kind="stable")
+    else:
+        keys = np.array([key(x) for x in b])
+        b[...] = b[np.argsort(keys, kind="stable")]
+    return a
+
+
+def _merge_sort_keys(keys, vals):
+    """Sort vals by keys, where keys may be the same list as vals"""
+    n = len(keys)
+    bounds = _find_runs(keys, vals)
+    buf_keys = [None] * n
+    buf_vals = buf_keys if vals is keys else [None] * n
+    while len(bounds) > 2:
+        merged = [0]
+        for r in range(0, len(bounds) - 1, 2):
+            lo = bounds[r]
+            if r + 2 < len(bounds):
+                mid, hi = bounds[r + 1], bounds[r + 2]
+                _merge_runs(keys, vals, buf_keys, buf_vals, lo, mid, hi)
+            else:
+                hi = bounds[r + 1]
+                buf_keys[lo:hi] = keys[lo:hi]
+                if vals is not keys:
+                    buf_vals[lo:hi] = vals[lo:hi]
+            merged.append(hi)
+        bounds = merged
+        keys, buf_keys = buf_keys, keys
+        vals, buf_vals = buf_vals, vals
+    return vals
+
+
+def _find_runs(keys, vals):
+    """Split into sorted runs of at least MERGE_SORT_CUTOFF elements
+
+    Strictly descending runs are reversed (which keeps the sort stable), short
+    runs are extended with insertion sort. Returns the list of run boundaries
+    [0, b_1, ..., n].
+    """
+    n = len(keys)
+    bounds = [0]
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if (hi < n) and (keys[hi] < keys[lo]):
+            while (hi < n) and (keys[hi] < keys[hi - 1]):
+                hi += 1
+            keys[lo:hi] = keys[lo:hi][::-1]
+            if vals is not keys:
+                vals[lo:hi] = vals[lo:hi][::-1]
+        else:
+            while (hi < n) and not (keys[hi] < keys[hi - 1]):
+                hi += 1
+        if hi - lo < MERGE_SORT_CUTOFF:
+            end = min(lo + MERGE_SORT_CUTOFF, n)
+            _insertion_sort_range(keys, vals, lo, hi, end)
+            hi = end
+        bounds.append(hi)
+        lo = hi
+    return bounds
+
+
+def _insertion_sort_range(keys, vals, lo, start, hi):
+    """Insertion sort of keys[lo:hi] (and vals) in place, keys[lo:start] is sorted"""
+    for k in range(start, hi):
+        x = keys[k]
+        v = vals[k]
+        j = k - 1
+        while (j >= lo) and (x < keys[j]):
+            keys[j + 1] = keys[j]
+            vals[j + 1] = vals[j]
+            j = j - 1
+        keys[j + 1] = x
+        vals[j + 1] = v
+
+
+def _merge_runs(keys, vals, buf_keys, buf_vals, lo, mid, hi):
+    """Stable merge of the sorted runs [lo, mid) and [mid, hi) into the buffer"""
+    i, j, t = lo, mid, lo
+    if vals is keys:
+        while (i < mid) and (j < hi):
+            if keys[j] < keys[i]:
+                buf_keys[t] = keys[j]
+                j += 1
+            else:
+                buf_keys[t] = keys[i]
+                i += 1
+            t += 1
+    else:
+        while (i < mid) and (j < hi):
+            if keys[j] < keys[i]:
+                buf_keys[t] = keys[j]
+                buf_vals[t] = vals[j]
+                j += 1
+            else:
+                buf_keys[t] = keys[i]
+                buf_vals[t] = vals[i]
+                i += 1
+            t += 1
+        buf_vals[t:t + mid - i] = vals[i:mid]
+        buf_vals[t + mid - i:hi] = vals[j:hi]
+    buf_keys[t:t + mid - i] = keys[i:mid]
+    buf_keys[t + mid - i:hi] = keys[j:hi]
+
+
+##################################################################
+# Parallel sorting
+##################################################################
+
+# Inputs shorter than this are sorted with merge_sort in the calling process
+PARALLEL_SORT_MIN_SIZE = 10000
+
+
+def parallel_sort(a, workers=None):
+    """Sort a in ascending order using a pool of worker processes
+
+    Lists are split into one partition per worker, the partitions are sorted
+    with merge_sort() in the workers and then merged pairwise in parallel
+    (merge tree). A new sorted list is returned.
+
+    NumPy arrays are copied once into shared memory, so that they are not
+    pickled for the workers, and sorted by parallel sorting by regular
+    sampling: every worker first sorts one contiguous partition, splitters
+    chosen from regular samples of the sorted partitions then divide the value
+    range into one bucket per worker, and every worker merges the parts of all
+    partitions which fall into its bucket. The array is sorted in place and
+    returned. Arrays of dtype object are sorted like lists and copied back.
+
+    input:
+        a = unsorted list or NumPy array
+        workers = number of worker processes (default: number of CPUs)
+    output:
+        sorted list containing all elements from a
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if (workers <= 1) or (len(a) < PARALLEL_SORT_MIN_SIZE):
+        return merge_sort(a)
+    if isinstance(a, np.ndarray) and a.dtype.hasobject:
+        # shared memory would only share the object pointers, which are not
+        # valid in other processes; use the list path and copy back instead
+        for i, x in enumerate(_parallel_sort_list(a.tolist(), workers)):
+            a[i] = x
+        return a
+    if isinstance(a, np.ndarray):
+        return _parallel_sort_array(a, workers)
+    return _parallel_sort_list(list(a), workers)
+
+
+def _partition_bounds(n, p):
+    """Boundaries [0, b_1, ..., n] of p nearly equal contiguous partitions"""
+    return [(n * j) // p for j in range(p + 1)]
+
+
+def _parallel_sort_list(a, workers):
+    bounds = _partition_bounds(len(a), workers)
+    parts = [a[bounds[j]:bounds[j + 1]] for j in range(workers)]
+    with futures.ProcessPoolExecutor(workers) as pool:
+        parts = list(pool.map(merge_sort, parts))
+        while len(parts) > 1:
+            merged = list(pool.map(merge, parts[0::2], parts[1::2]))
+            if len(parts) % 2 == 1:
+                merged.append(parts[-1])
+            parts = merged
+    return parts[0]
+
+
+def _parallel_sort_array(a, workers):
+    from multiprocessing import shared_memory
+
+    if not (a.ndim == 1):
+        raise Exception("parallel_sort only supports one-dimensional arrays.")
+    n = len(a)
+    src = shared_memory.SharedMemory(create=True, size=a.nbytes)
+    dst = shared_memory.SharedMemory(create=True, size=a.nbytes)
+    try:
+        x = np.ndarray(a.shape, dtype=a.dtype, buffer=src.buf)
+        x[...] = a
+        bounds = _partition_bounds(n, workers)
+        spec = (src.name, dst.name, a.dtype.str, n)
+        with futures.ProcessPoolExecutor(workers) as pool:
+            list(pool.map(_sort_shared_partition, [spec] * workers, bounds[:-1], bounds[1:]))
+            # regular samples of the sorted partitions give the splitters
+            samples = np.concatenate([
+                x[bounds[j]:bounds[j + 1]][
+                    np.linspace(0, bounds[j + 1] - bounds[j] - 1, workers).astype(int)]
+                for j in range(workers)])
+            samples.sort()
+            splitters = samples[workers::workers][:workers - 1]
+            # cuts[j, i] = start of bucket i within partition j
+            cuts = np.array([
+                np.concatenate(([bounds[j]],
+                                bounds[j] + np.searchsorted(x[bounds[j]:bounds[j + 1]], splitters, side="right"),
+                                [bounds[j + 1]]))
+                for j in range(workers)])
+            sizes = (cuts[:, 1:] - cuts[:, :-1]).sum(axis=0)
+            offsets = np.concatenate(([0], np.cumsum(sizes)))
+            segments = [[(int(cuts[j, i]), int(cuts[j, i + 1])) for j in range(workers)]
+                        for i in range(workers)]
+            list(pool.map(_merge_shared_segments, [spec] * workers, segments,
+                          [int(o) for o in offsets[:-1]]))
+        a[...] = np.ndarray(a.shape, dtype=a.dtype, buffer=dst.buf)
+        del x
+    finally:
+        for shm in (src, dst):
+            shm.close()
+            shm.unlink()
+    return a
+
+
+def _sort_shared_partition(spec, lo, hi):
+    """Worker: sort the partition [lo, hi) of the shared source array in place"""
+    from multiprocessing import shared_memory
+
+    src_name, dst_name, dtype, n = spec
+    src = shared_memory.SharedMemory(name=src_name)
+    try:
+        x = np.ndarray((n,), dtype=dtype, buffer=src.buf)
+        x[lo:hi].sort(kind="stable")
+        del x
+    finally:
+        src.close()
+
+
+def _merge_shared_segments(spec, segments, offset):
+    """Worker: merge sorted segments of the source array into the destination"""
+    from multiprocessing import shared_memory
+
+    src_name, dst_name, dtype, n = spec
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    try:
+        x = np.ndarray((n,), dtype=dtype, buffer=src.buf)
+        y = np.ndarray((n,), dtype=dtype, buffer=dst.buf)
+        merged = np.concatenate([x[lo:hi] for lo, hi in segments])
+        # the stable sort (Timsort/radix sort) merges the sorted runs efficiently
+        merged.sort(kind="stable")
+        y[offset:offset + len(merged)] = merged
+        del x, y
+    finally:
+        src.close()
+        dst.close()
+
+
+##################################################################
+# Reference implementations
+##################################################################
+
+
+def merge_reference(a1, a2):
+    """Merge two sorted lists a1 and a2 and return merged list
+
+    Original deque-based version, kept as a reference for benchmarks.
+
     input:
         a1 = first sorted list
         a2 = second sorted list
@@ -281,9 +810,11 @@ def merge(a1, a2):
     return a
 
 
-def merge_sort(a):
+def merge_sort_reference(a):
     """Sort the list a in ascending order and return sorted list
 
+    Original top-down version, kept as a reference for benchmarks.
+
     input:
         a = unsorted list
     output:
@@ -295,4 +826,4 @@ def merge_sort(a):
     else:
         a1 = a[: n // 2]
         a2 = a[n // 2 :]
-        return merge(merge_sort(a1), merge_sort(a2))
+        return merge_reference(merge_sort_reference(a1), merge_sort_reference(a2))
@@ -0,0 +1,179 @@
+"""
+*** profiler for recursive functions ***
+
+Records for every instrumented function
+  * the number of calls,
+  * the peak recursion depth,
+  * the total time (including calls to other functions) and the self time,
+  * a histogram of the number of calls at each recursion depth,
+and for every call stack the self time, which can be written as a folded-stack
+file for flame graph tools (e.g. flamegraph.pl or speedscope).
+
+There are two ways of instrumenting functions:
+
+1. The context manager profile_module() temporarily replaces functions in a
+   module by instrumented versions. Recursive calls go through the module
+   namespace, so they are instrumented too. Outside the with block the
+   original functions are restored and there is no overhead at all:
+
+   import model_solutions
+   import recursion_profiler
+
+   with recursion_profiler.profile_module(model_solutions, ["fib_rec"]) as prof:
+       model_solutions.fib_rec(20)
+   prof.report()
+   prof.write_folded("fib_rec.folded")
+
+2. The decorator @profiled instruments a function permanently. While the
+   default profiler is disabled (see enable() and disable()) the only overhead
+   is one extra function call and a flag check.
+"""
+
+import collections
+import contextlib
+import functools
+import time
+
+
+class FunctionStats(object):
+    """Statistics for one instrumented function"""
+
+    def __init__(self):
+        # current recursion depth, i.e. number of active calls
+        self.depth = 0
+        self.reset()
+
+    def reset(self):
+        """Discard the statistics; the depth of calls still active is kept"""
+        self.calls = 0
+        self.max_depth = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.depth_histogram = collections.Counter()
+
+
+class Profiler(object):
+    """Collects call counts, recursion depths and timings of wrapped functions"""
+
+    def __init__(self):
+        self.enabled = True
+        self.stats = collections.defaultdict(FunctionStats)
+        self.folded = collections.Counter()
+        # one entry [name, start time, time spent in instrumented callees] per active call
+        self._stack = []
+
+    def wrap(self, f, name=None):
+        """Return an instrumented version of the function f"""
+        if name is None:
+            name = f.__qualname__
+        stats = self.stats[name]
+        stack = self._stack
+        clock = time.perf_counter
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return f(*args, **kwargs)
+            stats.calls += 1
+            stats.depth += 1
+            if stats.depth > stats.max_depth:
+                stats.max_depth = stats.depth
+            stats.depth_histogram[stats.depth] += 1
+            frame = [name, clock(), 0.0]
+            stack.append(frame)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                elapsed = clock() - frame[1]
+                own = elapsed - frame[2]
+                self.folded[tuple(entry[0] for entry in stack)] += own
+                stack.pop()
+                stats.depth -= 1
+                stats.self_time += own
+                if stats.depth == 0:
+                    # only count the outermost call, nested calls are included
+                    stats.total_time += elapsed
+                if stack:
+                    stack[-1][2] += elapsed
+
+        wrapper.__wrapped_by_profiler__ = self
+        return wrapper
+
+    def reset(self):
+        """Discard all collected statistics
+
+        The FunctionStats objects are reset in place, since wrapped functions
+        keep a reference to theirs.
+        """
+        for stats in self.stats.values():
+            stats.reset()
+        self.folded.clear()
+
+    def report(self, max_depth_rows=10):
+        """Print the statistics of all functions and their call-depth histograms"""
+        print("%-24s %10s %10s %12s %12s" % ("function", "calls", "max depth", "total [s]", "self [s]"))
+        for name, s in sorted(self.stats.items(), key=lambda kv: -kv[1].total_time):
+            if s.calls == 0:
+                continue
+            print("%-24s %10d %10d %12.6f %12.6f"
+                  % (name, s.calls, s.max_depth, s.total_time, s.self_time))
+        for name, s in self.stats.items():
+            if s.calls == 0:
+                continue
+            print("\ncalls of %s per recursion depth" % name)
+            depths = sorted(s.depth_histogram)
+            if len(depths) > max_depth_rows:
+                # merge depths into max_depth_rows bins of equal width
+                width = -(-len(depths) // max_depth_rows)
+                bins = collections.Counter()
+                for d in depths:
+                    bins[(d - 1) // width] += s.depth_histogram[d]
+                rows = [("%d-%d" % (b * width + 1, (b + 1) * width), c) for b, c in sorted(bins.items())]
+            else:
+                rows = [(str(d), s.depth_histogram[d]) for d in depths]
+            largest = max(c for _, c in rows)
+            for label, c in rows:
+                print("%10s %10d %s" % (label, c, "#" * max(1, round(40 * c / largest))))
+
+    def write_folded(self, path):
+        """Write the self time per call stack in microseconds as a folded-stack file
+
+        Each line has the form "f;g;h 123", i.e. the call stack from the
+        outermost to the innermost instrumented function and its self time.
+        """
+        with open(path, "w") as f:
+            for stack, seconds in sorted(self.folded.items()):
+                f.write("%s %d\n" % (";".join(stack), round(seconds * 1e6)))
+
+
+@contextlib.contextmanager
+def profile_module(module, names, profiler=None):
+    """Instrument the functions with the given names in module inside a with block"""
+    if profiler is None:
+        profiler = Profiler()
+    originals = {name: getattr(module, name) for name in names}
+    try:
+        for name, f in originals.items():
+            setattr(module, name, profiler.wrap(f, name))
+        yield profiler
+    finally:
+        for name, f in originals.items():
+            setattr(module, name, f)
+
+
+# Profiler used by the @profiled decorator, disabled until enable() is called
+default_profiler = Profiler()
+default_profiler.enabled = False
+
+
+def profiled(f):
+    """Decorator instrumenting f with the default profiler"""
+    return default_profiler.wrap(f)
+
+
+def enable():
+    default_profiler.enabled = True
+
+
+def disable():
+    default_profiler.enabled = False
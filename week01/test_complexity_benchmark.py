@@ -0,0 +1,60 @@
+'''Tests for the complexity fitting and regression checks on synthetic times'''
+import math
+import pytest
+import complexity_benchmark
+from complexity_benchmark import Benchmark
+
+PHI = (1 + math.sqrt(5)) / 2
+SIZES = complexity_benchmark.geometric_sizes(2**6, 2**14, 7)
+
+
+def _benchmark(complexity, expected, tolerance=0.1, sizes=SIZES):
+    return Benchmark("synthetic", None, None, sizes, complexity, expected, tolerance)
+
+
+def test_fit_power():
+    '''Check that t = 3e-9 n^2 gives exponent 2 and constant 3e-9'''
+    b = _benchmark("power", 2)
+    exponent, constant = complexity_benchmark.fit(b, [3e-9 * n**2 for n in SIZES])
+    assert exponent == pytest.approx(2)
+    assert constant == pytest.approx(3e-9)
+
+
+def test_fit_nlogn():
+    '''Check that t = 2e-8 n log n gives exponent 1 and constant 2e-8'''
+    b = _benchmark("nlogn", 1)
+    exponent, constant = complexity_benchmark.fit(b, [2e-8 * n * math.log2(n) for n in SIZES])
+    assert exponent == pytest.approx(1)
+    assert constant == pytest.approx(2e-8)
+
+
+def test_fit_exp():
+    '''Check that t = 1e-7 phi^n gives base phi'''
+    sizes = list(range(10, 30, 4))
+    b = _benchmark("exp", PHI, sizes=sizes)
+    exponent, constant = complexity_benchmark.fit(b, [1e-7 * PHI**n for n in sizes])
+    assert exponent == pytest.approx(PHI)
+    assert constant == pytest.approx(1e-7)
+
+
+def _results(b, times):
+    exponent, constant = complexity_benchmark.fit(b, times)
+    return {b.name: {"exponent": exponent, "constant": constant}}
+
+
+def test_check_constant_regression():
+    '''Check that a constant factor twice the baseline is reported'''
+    b = _benchmark("power", 2)
+    baseline = _results(b, [1e-9 * n**2 for n in SIZES])
+    assert complexity_benchmark.check(baseline, [b], baseline) == []
+    problems = complexity_benchmark.check(_results(b, [2e-9 * n**2 for n in SIZES]), [b], baseline)
+    assert len(problems) == 1 and "constant factor" in problems[0]
+
+
+def test_check_exponent_regression():
+    '''Check that t = n^2.5 is reported against expected and baseline exponent 2'''
+    b = _benchmark("power", 2)
+    baseline = _results(b, [1e-9 * n**2 for n in SIZES])
+    problems = complexity_benchmark.check(_results(b, [1e-9 * n**2.5 for n in SIZES]), [b], baseline)
+    assert any("differs from expected" in p for p in problems)
+    assert any("regressed from baseline 2.000" in p for p in problems)
@@ -0,0 +1,43 @@
+'''Tests for the external merge sort'''
+import csv
+import os
+import external_sort
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows([["Year", "Value"]] + rows)
+
+
+def _rows():
+    return [[str(1850 + k), str((k * 37) % 11 - 5.5)] for k in range(200)]
+
+
+def test_sort_to_file(tmp_path):
+    '''Check that sorting with many small runs agrees with sorted() and is stable'''
+    _write_csv(tmp_path / "data.csv", _rows())
+    output = tmp_path / "sorted.csv"
+    external_sort.external_sort(str(tmp_path / "data.csv"), "Value", output=str(output),
+                                memory_limit=200, run_dir=str(tmp_path))
+    with open(output, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Year", "Value"]
+    assert rows[1:] == sorted(_rows(), key=lambda row: float(row[1]))
+    assert [p for p in os.listdir(tmp_path) if p.startswith("external_sort_")] == []
+
+
+def test_generator_cleanup(tmp_path):
+    '''Check that unused and partially used generators leave no run files behind'''
+    _write_csv(tmp_path / "data.csv", _rows())
+    run_dir = tmp_path / "runs"
+    os.mkdir(run_dir)
+    rows = external_sort.external_sort(str(tmp_path / "data.csv"), 1, memory_limit=200,
+                                       run_dir=str(run_dir), reverse=True)
+    del rows
+    assert os.listdir(run_dir) == []
+    rows = external_sort.external_sort(str(tmp_path / "data.csv"), 1, memory_limit=200,
+                                       run_dir=str(run_dir), reverse=True)
+    assert next(rows) == max(_rows(), key=lambda row: float(row[1]))
+    assert len(os.listdir(run_dir)) == 1
+    rows.close()
+    assert os.listdir(run_dir) == []
@@ -0,0 +1,58 @@
+'''Tests for the exact Fibonacci numbers'''
+import pytest
+import fibonacci
+
+
+def fib_reference(n):
+    '''F_n by simple iteration'''
+    a, b = 0, 1
+    for k in range(n):
+        a, b = b, a + b
+    return a
+
+
+@pytest.fixture(autouse=True)
+def empty_memo():
+    fibonacci._memo.clear()
+    yield
+    fibonacci._memo.clear()
+
+
+def test_small():
+    '''Check F_0, ..., F_100 against the reference'''
+    assert [fibonacci.fib(n) for n in range(101)] == [fib_reference(n) for n in range(101)]
+
+
+def test_step_backwards():
+    '''Check a query just below a memoised index, which steps backwards'''
+    fibonacci.fib(1000)
+    assert fibonacci.fib(990) == fib_reference(990)
+    assert fibonacci._step(10, (55, 89), 3) == (2, 3)
+
+
+def test_doubling_from_prefix(monkeypatch):
+    '''Check that doubling continues from a memoised n >> s'''
+    fibonacci.fib(1000)
+    calls = []
+    double = fibonacci._double
+
+    def spy(pair, bits):
+        calls.append((pair, bits))
+        return double(pair, bits)
+    monkeypatch.setattr(fibonacci, "_double", spy)
+    n = 4 * 1000 + 3
+    assert fibonacci.fib(n) == fib_reference(n)
+    assert calls == [(fibonacci._memo[1000], "11")]
+
+
+def test_fib_many():
+    '''Check unsorted indices with duplicates, small and large gaps'''
+    ns = [500, 3, 40, 3, 520, 2000, 41, 0, 2000]
+    assert fibonacci.fib_many(ns) == [fib_reference(n) for n in ns]
+
+
+def test_fib_mod():
+    '''Check F_n mod m against the reference, including m = 1'''
+    for n in [0, 1, 2, 10, 97, 1000]:
+        for m in [1, 2, 10, 1000003]:
+            assert fibonacci.fib_mod(n, m) == fib_reference(n) % m
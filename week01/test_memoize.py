@@ -0,0 +1,31 @@
+'''Tests for the persistent memoization decorator'''
+import os
+import subprocess
+import sys
+from memoize import memoize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _function_id_in_subprocess(name, seed):
+    code = "import model_solutions, memoize; print(memoize._function_id(model_solutions.%s))" % name
+    env = dict(os.environ, PYTHONHASHSEED=str(seed))
+    return subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env,
+                          capture_output=True, text=True, check=True).stdout
+
+
+def test_function_id_stable_across_processes():
+    '''Check that functions with nested code objects get the same id in every kernel'''
+    for name in ["merge_sort", "fib_rec"]:
+        assert _function_id_in_subprocess(name, 1) == _function_id_in_subprocess(name, 2)
+
+
+def test_disk_hit(tmp_path):
+    '''Check that a second decorated copy reuses the result from disk'''
+    def square(x):
+        return [x*x]
+    first = memoize(cache_dir=str(tmp_path))(square)
+    second = memoize(cache_dir=str(tmp_path))(square)
+    assert first(7) == [49]
+    assert second(7) == [49]
+    assert second.cache_info()["disk_hits"] == 1
@@ -0,0 +1,143 @@
+'''Tests for the model solutions'''
+import numpy as np
+import fibonacci
+import model_solutions
+
+
+def test_sorted_index_insert_upcasts():
+    '''Check that inserting a float into an int index keeps its value'''
+    index = model_solutions.SortedIndex([1, 3, 5])
+    index.insert(2.5)
+    assert index.contains([2.5]).tolist() == [True]
+    assert index.values().tolist() == [1, 2.5, 3, 5]
+
+
+def test_sorted_index_queries():
+    '''Check position and count_range after inserts into the buffer and merges'''
+    index = model_solutions.SortedIndex([7, 1, 5, 3])
+    index.insert([4, 4])
+    assert index.position([4, 6]).tolist() == [2, -1]
+    assert index.count_range(3, 5).tolist() == 4
+    index.insert(np.arange(10, 20))
+    assert len(index) == 16
+    assert index.values().tolist() == sorted([7, 1, 5, 3, 4, 4] + list(range(10, 20)))
+
+
+def test_merge_sort_empty():
+    '''Check that empty and one-element inputs are sorted'''
+    assert model_solutions.merge_sort([]) == []
+    assert model_solutions.merge_sort([3]) == [3]
+    assert model_solutions.merge_sort(np.array([])).tolist() == []
+
+
+def test_merge_sort_random():
+    '''Check merge_sort against sorted() on random lists, including long runs'''
+    rng = np.random.default_rng(0)
+    for n in [2, 7, 8, 9, 100, 1000]:
+        a = rng.integers(0, n // 2 + 1, n).tolist()
+        assert model_solutions.merge_sort(a) == sorted(a)
+        assert model_solutions.merge_sort(sorted(a)[::-1]) == sorted(a)
+
+
+def test_merge_sort_key_reverse_stable():
+    '''Check that equal keys keep their input order with key= and reverse='''
+    a = [(k % 5, k) for k in range(40)]
+    key = lambda x: x[0]
+    assert model_solutions.merge_sort(a, key=key) == sorted(a, key=key)
+    assert model_solutions.merge_sort(a, key=key, reverse=True) == sorted(a, key=key, reverse=True)
+    assert a == [(k % 5, k) for k in range(40)]
+
+
+def test_merge_stable():
+    '''Check that merge takes equal elements from the first list first'''
+    assert model_solutions.merge([], [1, 2]) == [1, 2]
+    assert [type(x) for x in model_solutions.merge([1.0, 2], [1, 2.0])] == [float, int, int, float]
+
+
+def test_merge_sort_array_in_place():
+    '''Check that NumPy arrays are sorted in place, also with reverse and key'''
+    rng = np.random.default_rng(1)
+    a = rng.random(100)
+    b = a.copy()
+    assert model_solutions.merge_sort(a) is a
+    assert a.tolist() == sorted(b.tolist())
+    model_solutions.merge_sort(a, reverse=True)
+    assert a.tolist() == sorted(b.tolist(), reverse=True)
+    model_solutions.merge_sort(a, key=lambda x: abs(x - 0.5))
+    assert a.tolist() == sorted(b.tolist(), key=lambda x: abs(x - 0.5))
+
+
+def test_power_mat_exact():
+    '''Check that exact=True gives F_100 without int64 overflow'''
+    A = np.array([[1, 1], [1, 0]])
+    assert model_solutions.power_mat(A, 100, exact=True)[0, 1] == fibonacci.fib(100)
+
+
+def test_power_mat_mod():
+    '''Check that mod= gives F_n mod p for n = 10^18, p = 10^9 + 7'''
+    p = 10**9 + 7
+    A = np.array([[1, 1], [1, 0]])
+    assert model_solutions.power_mat(A, 10**18, mod=p)[0, 1] == fibonacci.fib_mod(10**18, p)
+
+
+def test_power_mat_stacked():
+    '''Check that a stack of matrices is raised to the power matrix by matrix'''
+    rng = np.random.default_rng(2)
+    A = rng.integers(-3, 4, (4, 3, 3))
+    P = model_solutions.power_mat(A, 5)
+    for k in range(4):
+        assert (P[k] == np.linalg.matrix_power(A[k], 5)).all()
+    assert (model_solutions.power_mat(A, 0) == np.eye(3)).all()
+
+
+def test_power_mat_int64_min():
+    '''Check that exact=True detects the overflow of (-2**63)^2'''
+    A = np.array([[-2**63, 0], [0, 1]])
+    assert model_solutions.power_mat(A, 2, exact=True)[0, 0] == 2**126
+
+
+def test_power_mat_large_unsigned():
+    '''Check that uint64 entries beyond the int64 range are not wrapped around'''
+    A = np.array([[2**63 + 5, 0], [0, 1]], dtype=np.uint64)
+    assert model_solutions.power_mat(A, 1, mod=7)[0, 0] == (2**63 + 5) % 7
+    assert model_solutions.power_mat(A, 2, exact=True)[0, 0] == (2**63 + 5)**2
+
+
+def test_parallel_sort_list(monkeypatch):
+    '''Check the merge tree of parallel_sort on a list'''
+    monkeypatch.setattr(model_solutions, "PARALLEL_SORT_MIN_SIZE", 10)
+    rng = np.random.default_rng(3)
+    a = rng.random(1001).tolist()
+    for workers in [2, 3]:
+        assert model_solutions.parallel_sort(a, workers=workers) == sorted(a)
+
+
+def test_parallel_sort_array_duplicates(monkeypatch):
+    '''Check sorting by regular sampling on an int array with many duplicates'''
+    monkeypatch.setattr(model_solutions, "PARALLEL_SORT_MIN_SIZE", 10)
+    rng = np.random.default_rng(4)
+    for workers in [2, 3]:
+        a = rng.integers(0, 5, 1000)
+        expected = np.sort(a)
+        assert model_solutions.parallel_sort(a, workers=workers) is a
+        assert (a == expected).all()
+
+
+def test_parallel_sort_array_skewed(monkeypatch):
+    '''Check sorting by regular sampling on a skewed float array'''
+    monkeypatch.setattr(model_solutions, "PARALLEL_SORT_MIN_SIZE", 10)
+    rng = np.random.default_rng(5)
+    for workers in [2, 3]:
+        a = np.concatenate((np.zeros(700), rng.standard_exponential(301) ** 4))
+        rng.shuffle(a)
+        expected = np.sort(a)
+        model_solutions.parallel_sort(a, workers=workers)
+        assert (a == expected).all()
+
+
+def test_parallel_sort_object_array(monkeypatch):
+    '''Check that object arrays are sorted without sharing pointers'''
+    monkeypatch.setattr(model_solutions, "PARALLEL_SORT_MIN_SIZE", 10)
+    a = np.array([(k * 37) % 101 for k in range(101)] + [2**70], dtype=object)
+    model_solutions.parallel_sort(a, workers=2)
+    assert a.tolist() == sorted([(k * 37) % 101 for k in range(101)] + [2**70])
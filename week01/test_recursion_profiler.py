@@ -0,0 +1,45 @@
+'''Tests for the profiler for recursive functions'''
+import model_solutions
+import recursion_profiler
+
+
+def test_counts_and_depth():
+    '''Check the number of calls and the depth histogram of fib_rec(10)'''
+    with recursion_profiler.profile_module(model_solutions, ["fib_rec"]) as prof:
+        model_solutions.fib_rec(10)
+    stats = prof.stats["fib_rec"]
+    assert stats.calls == 177
+    assert stats.max_depth == 10
+    assert sum(stats.depth_histogram.values()) == stats.calls
+    assert stats.depth == 0
+
+
+def test_reset():
+    '''Check that wrapped functions keep recording after reset()'''
+    prof = recursion_profiler.Profiler()
+
+    def countdown(n):
+        return 0 if n == 0 else countdown(n-1)
+    countdown = prof.wrap(countdown, "countdown")
+    countdown(5)
+    prof.reset()
+    assert prof.stats["countdown"].calls == 0
+    countdown(3)
+    assert prof.stats["countdown"].calls == 4
+    assert prof.stats["countdown"].max_depth == 4
+
+
+def test_profiled_disabled():
+    '''Check that @profiled functions record nothing while the profiler is disabled'''
+    @recursion_profiler.profiled
+    def square(x):
+        return x*x
+    recursion_profiler.default_profiler.reset()
+    square(3)
+    assert recursion_profiler.default_profiler.stats["test_profiled_disabled.<locals>.square"].calls == 0
+    recursion_profiler.enable()
+    try:
+        square(3)
+    finally:
+        recursion_profiler.disable()
+    assert recursion_profiler.default_profiler.stats["test_profiled_disabled.<locals>.square"].calls == 1
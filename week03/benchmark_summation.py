@@ -0,0 +1,51 @@
+'''Benchmark of the summation methods in summation.py
+
+Compares the accuracy and throughput of the methods with a plain Python loop
+and numpy.sum on random data sets with and without cancellation. Run with
+
+python benchmark_summation.py
+'''
+import timeit
+from fractions import Fraction
+import numpy as np
+import summation
+
+def loop_sum(xs):
+    '''Add the terms one by one, as in the week01 lecture'''
+    s = 0.0
+    for x in xs:
+        s = s + x
+    return s
+
+def data_sets(n, seed=0):
+    '''Random data sets of n terms: well conditioned, and with cancellation
+    between terms of very different magnitudes'''
+    rng = np.random.default_rng(seed)
+    uniform = rng.random(n)
+    wide = rng.standard_normal(n) * 10.0**rng.integers(-12, 12, n)
+    cancelling = np.concatenate((wide, -wide[:n//2]))
+    rng.shuffle(cancelling)
+    return [('uniform', uniform), ('wide range', wide), ('cancelling', cancelling)]
+
+def run(n=100000, number=3, chunk_size=10000):
+    '''Print relative error and million terms per second of each method'''
+    methods = [('python loop', lambda xs: loop_sum(xs.tolist())),
+               ('numpy.sum', lambda xs: float(np.sum(xs)))]
+    for method in summation.METHODS:
+        methods.append((method, lambda xs, method=method: summation.sum_chunks(
+            (xs[k:k+chunk_size] for k in range(0, len(xs), chunk_size)), method)))
+    for name, xs in data_sets(n):
+        q = summation.total(xs, 'rational')
+        exact = Fraction(q[0], q[1])
+        print(f'{name}: {len(xs)} terms in chunks of {chunk_size} ({number} runs)')
+        print(f'  {"method":15s} {"relative error":>15s} {"Mterms/s":>10s}')
+        for method_name, f in methods:
+            s = f(xs)
+            if isinstance(s, list):
+                s = Fraction(s[0], s[1])
+            error = abs(Fraction(s) - exact) / abs(exact) if exact != 0 else abs(Fraction(s))
+            t = timeit.timeit(lambda: f(xs), number=number) / number
+            print(f'  {method_name:15s} {float(error):15.3e} {len(xs) / t / 1e6:10.2f}')
+
+if __name__ == '__main__':
+    run()
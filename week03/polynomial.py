@@ -3,6 +3,7 @@
 This module contains functions for adding and multiplying rational polynomials.
 '''
 
+import math
 import rational
 import numpy as np
 
@@ -23,7 +24,21 @@ def add(p,q):
     return _simplify(r)
 
 def mul(p,q):
-    '''multiply two polynomials p(x), q(x) with rational coefficients'''
+    '''multiply two polynomials p(x), q(x) with rational coefficients
+
+    If all denominators are positive, the product is computed exactly with a
+    single big integer multiplication (see _mul_kronecker()), otherwise the
+    schoolbook method _mul_schoolbook() is used.
+    '''
+    assert len(p) >= 1
+    assert len(q) >= 1
+    if all(c[1] > 0 for c in p) and all(c[1] > 0 for c in q):
+        return _mul_kronecker(p,q)
+    else:
+        return _mul_schoolbook(p,q)
+
+def _mul_schoolbook(p,q):
+    '''multiply two polynomials coefficient by coefficient in O(deg_p*deg_q)'''
     deg_p = len(p)-1
     assert deg_p >= 0
     deg_q = len(q)-1
@@ -38,6 +53,63 @@ def mul(p,q):
                 r[j] = rational.add(r[j],rational.mul(p[k],q[j-k]))
     return _simplify(r)
 
+def _common_denominator(p):
+    '''Write p(x) = P(x)/d with an integer polynomial P and integer d > 0
+
+    Output:
+      * list of integer coefficients of P
+      * common denominator d = lcm of all denominators of p
+    '''
+    d = math.lcm(*[c[1] for c in p])
+    return [c[0]*(d//c[1]) for c in p], d
+
+def _pack(a, nbytes):
+    '''Kronecker substitution: return the integer sum_j a_j * 2^(8*nbytes*j)
+
+    The coefficients a_j may be negative but must satisfy |a_j| < 2^(8*nbytes-1).
+    '''
+    k = 8*nbytes
+    mask = (1 << k) - 1
+    # two's complement digits, corrected by the borrow of every negative digit
+    digits = b''.join((x & mask).to_bytes(nbytes,'little') for x in a)
+    borrows = b''.join((x < 0).to_bytes(nbytes,'little') for x in a)
+    return int.from_bytes(digits,'little') - (int.from_bytes(borrows,'little') << k)
+
+def _unpack(z, n, nbytes):
+    '''Inverse of _pack(): extract n signed coefficients from the integer z'''
+    k = 8*nbytes
+    half = 1 << (k-1)
+    # shifting every digit by 2^(k-1) makes all of them non-negative
+    offset = int.from_bytes(half.to_bytes(nbytes,'little')*n,'little')
+    data = (z + offset).to_bytes(n*nbytes,'little')
+    return [int.from_bytes(data[j*nbytes:(j+1)*nbytes],'little') - half
+            for j in range(n)]
+
+def _mul_kronecker(p,q):
+    '''multiply two polynomials with positive denominators by Kronecker substitution
+
+    Both polynomials are scaled to integer polynomials P = d_p*p and Q = d_q*q.
+    These are evaluated at x = 2^k for a k which is large enough to keep the
+    coefficients of P*Q apart, multiplied as one (Python big) integer and the
+    coefficients of P*Q are read off from the digits of the result. Python uses
+    Karatsuba multiplication for big integers, so the cost is sub-quadratic in
+    the degree. Each coefficient of p*q = (P*Q)/(d_p*d_q) is reduced by a gcd
+    only once at the end.
+    '''
+    a, d_p = _common_denominator(p)
+    b, d_q = _common_denominator(q)
+    d = d_p*d_q
+    r = [rational._simplify_rational([c,d]) for c in _int_mul(a,b)]
+    return _simplify(r)
+
+def _int_mul(a,b):
+    '''Coefficients of the product of two integer polynomials (Kronecker substitution)'''
+    n = len(a) + len(b) - 1
+    bound = min(len(a),len(b)) * max(abs(x) for x in a) * max(abs(x) for x in b)
+    nbytes = (bound.bit_length() + 1)//8 + 1
+    z = _pack(a,nbytes) * _pack(b,nbytes)
+    return _unpack(z,n,nbytes)
+
 def to_str(p):
     '''Convert to string representation'''
     deg = len(p)-1
@@ -53,8 +125,11 @@ def to_str(p):
 
 def _simplify(p):
     '''Chop off leading terms'''
-    if (len(p)>1) and (p[-1][0] == 0):
-        return _simplify(p[:-1])
+    n = len(p)
+    while (n>1) and (p[n-1][0] == 0):
+        n -= 1
+    if n < len(p):
+        return p[:n]
     else:
         return p
 
@@ -66,6 +141,75 @@ def evaluate(p,x):
         q = rational.add(p[k],rational.mul(x,q))
     return q
 
+def evaluate_many(p,xs,mode='exact'):
+    '''Evaluate polynomial at many points at once using a vectorised Horner's rule
+
+    Input:
+      * polynomial p with rational coefficients
+      * points xs, either a list of rational numbers [[a_0,b_0],[a_1,b_1],...],
+        a rational.RationalArray or (for mode='float') a list or array of
+        floats of any shape, which is evaluated element-wise
+      * mode: 'exact' returns exact rational values, 'float' uses float64
+        arithmetic
+
+    Output:
+      * mode='exact': list of rational numbers [p(x_0), p(x_1), ...]
+      * mode='float': NumPy array of floats [p(x_0), p(x_1), ...] (of the
+        shape of xs for float input)
+    '''
+    if mode == 'exact':
+        return _evaluate_many_exact(p,xs)
+    elif mode == 'float':
+        return _evaluate_many_float(p,xs)
+    else:
+        raise ValueError("mode must be 'exact' or 'float'")
+
+def _evaluate_many_float(p,xs):
+    '''Horner's rule in float64 arithmetic for all points simultaneously'''
+    if isinstance(xs,rational.RationalArray):
+        x = xs.num.astype(float) / xs.denom.astype(float)
+    elif (not isinstance(xs,np.ndarray)) and (len(xs) > 0) and isinstance(xs[0],(list,tuple)):
+        # list of rational numbers [a_j, b_j]
+        q = np.asarray(xs,dtype=float)
+        x = q[:,0] / q[:,1]
+    else:
+        # points of any shape, evaluated element-wise
+        x = np.asarray(xs,dtype=float)
+    y = np.full(x.shape,p[-1][0]/p[-1][1])
+    for k in range(len(p)-2,-1,-1):
+        y *= x
+        y += p[k][0]/p[k][1]
+    return y
+
+def _evaluate_many_exact(p,xs):
+    '''Exact Horner's rule with integers only for all points simultaneously
+
+    With p(x) = P(x)/d for an integer polynomial P and x_j = a_j/b_j,
+    p(x_j) = N_j / (d*b_j^deg) where N_j = sum_k P_k a_j^k b_j^(deg-k) is
+    computed by Horner's rule on the integer columns a, b. The fractions are
+    reduced with a single gcd at the end.
+    '''
+    if not isinstance(xs,rational.RationalArray):
+        xs = rational.RationalArray.from_list(xs)
+    sign = np.where(xs.denom < 0,-1,1)
+    a = xs.num*sign
+    b = xs.denom*sign
+    P, d = _common_denominator(p)
+    deg = len(P)-1
+    # N_j and b_j^deg stay below 2^bits, use int64 if this is safe
+    bits = deg*max(rational._max_bits(a),rational._max_bits(b)) \
+        + max(abs(c) for c in P).bit_length() + (deg+1).bit_length() + d.bit_length()
+    if bits >= 63:
+        a, b = rational._widen(a,b)
+    N = np.full(len(a),P[-1],dtype=a.dtype)
+    B = np.ones(len(a),dtype=a.dtype)
+    for k in range(deg-1,-1,-1):
+        B *= b
+        N *= a
+        N += P[k]*B
+    num, denom = rational._simplify_columns(N,d*B)
+    return rational.RationalArray._from_columns(num,denom).to_list()
+
 def integrate(p):
     '''integrate a polynomial'''
     deg = len(p)-1
@@ -75,3 +219,52 @@ def integrate(p):
     for n in range(2,deg+2):
         q[n] = rational.mul([1,n],q[n])
     return _simplify(q)
+
+def shift(p,a):
+    '''Taylor shift: compute the polynomial p(x + a) for a rational number a
+
+    With p(x) = P(x)/d for an integer polynomial P of degree n and a = r/s,
+
+        s^n p(x + a) = T(s x) / d   where   T(y) = sum_k P_k s^(n-k) (y + r)^k
+
+    is an integer polynomial. T is computed from the coefficients P_k s^(n-k)
+    with O(n^2) integer additions and multiplications by r (repeated synthetic
+    division, Shaw and Traub). Each coefficient T_j / (d s^(n-j)) of p(x + a)
+    is reduced by a gcd only once at the end.
+    '''
+    r, s = a
+    if s < 0:
+        r, s = -r, -s
+    P, d = _common_denominator(p)
+    n = len(P)-1
+    s_pow = [1]
+    for k in range(n):
+        s_pow.append(s_pow[-1]*s)
+    T = [P[k]*s_pow[n-k] for k in range(n+1)]
+    if not (r == 0):
+        for k in range(n):
+            for j in range(n-1,k-1,-1):
+                T[j] += r*T[j+1]
+    q = [rational._simplify_rational([T[j], d*s_pow[n-j]]) for j in range(n+1)]
+    return _simplify(q)
+
+def compose(p,q):
+    '''Compute the composition p(q(x)) of two polynomials with rational coefficients
+
+    Divide-and-conquer Horner scheme: p(x) = p_lo(x) + x^h p_hi(x) with h a
+    power of two gives p(q) = p_lo(q) + q^h p_hi(q), where the powers
+    q, q^2, q^4, ... are computed once by repeated squaring. All products are
+    computed with the fast multiplication mul().
+    '''
+    q_pow = [q]
+    def _compose(c):
+        if len(c) == 1:
+            return [rational._simplify_rational(c[0])]
+        elif len(c) == 2:
+            return add([c[0]],mul([c[1]],q))
+        k = (len(c)-1).bit_length()-1
+        while len(q_pow) <= k:
+            q_pow.append(mul(q_pow[-1],q_pow[-1]))
+        h = 2**k
+        return add(_compose(c[:h]),mul(_compose(c[h:]),q_pow[k]))
+    return _simplify(_compose(p))
@@ -3,8 +3,15 @@
 This module provides functions for multiplying and adding rational numbers.
 Rational numbers are represented as pairs of integers. For example, the rational
 number a / b is stored as [a, b].
+
+For large batches of rational numbers the class RationalArray stores all
+numerators and denominators in two NumPy integer arrays and performs the
+arithmetic element-wise, so that only one vectorised gcd is needed per
+operation.
 '''
 import math
+import numbers
+import numpy as np
 
 def _simplify_rational(q):
     '''Cancel common integer factors in numerator and denominator
@@ -97,3 +104,209 @@ def to_str(q):
         return 0
     else:
         return str(num_q)+' / '+str(denom_q)
+
+# Largest absolute value of the entries for which the products and sums
+# formed in add() and mul() are guaranteed to fit into an int64
+_INT64_SAFE = 2**31 - 1
+
+def _as_column(a):
+    '''Convert a sequence of integers into a one-dimensional integer array
+
+    Values which do not fit into an int64 are stored as Python integers in an
+    array of dtype object. Non-integer values (e.g. floats) raise a TypeError
+    instead of being truncated.
+    '''
+    if not isinstance(a, np.ndarray):
+        try:
+            col = np.asarray(a)
+        except OverflowError:
+            col = None
+        # only use the fast conversion if NumPy found an integer dtype;
+        # e.g. [2**63, 1] becomes float64 and is checked entry by entry
+        if (col is not None) and (col.dtype.kind in 'biu'):
+            a = col
+    if isinstance(a, np.ndarray) and (a.dtype.kind in 'biu'):
+        if (a.dtype.kind == 'u') and (a.size > 0) and (int(a.max()) > np.iinfo(np.int64).max):
+            return a.astype(object).reshape(-1)
+        return a.astype(np.int64).reshape(-1)
+    values = np.asarray(a, dtype=object).reshape(-1)
+    for x in values:
+        if not isinstance(x, numbers.Integral):
+            raise TypeError("RationalArray entries must be integers, got " + repr(x))
+    try:
+        return np.array([int(x) for x in values], dtype=np.int64)
+    except OverflowError:
+        return np.array([int(x) for x in values], dtype=object)
+
+def _max_abs(col):
+    '''Largest absolute value of the entries as a Python integer
+
+    This is computed from the minimum and maximum, since np.abs(-2**63) wraps
+    around to -2**63 in int64.
+    '''
+    if len(col) == 0:
+        return 0
+    return max(abs(int(np.min(col))), abs(int(np.max(col))))
+
+def _fits_int64(*cols):
+    '''Check whether all entries are small enough for int64 arithmetic'''
+    for col in cols:
+        if _max_abs(col) > _INT64_SAFE:
+            return False
+    return True
+
+def _max_bits(col):
+    '''Number of bits of the entry of largest absolute value'''
+    return _max_abs(col).bit_length()
+
+def _widen(*cols):
+    '''Convert columns to Python big integers (dtype object)'''
+    return [col.astype(object) for col in cols]
+
+class RationalArray(object):
+    '''Array of rational numbers [a_0/b_0, a_1/b_1, ..., a_{n-1}/b_{n-1}]
+
+    The numerators a_j and denominators b_j are stored as two NumPy integer
+    arrays num and denom. Entries are int64 as long as this is exact, otherwise
+    the arrays fall back to Python big integers (dtype object).
+    '''
+
+    def __init__(self, num, denom=None):
+        '''Create a RationalArray from numerators and denominators
+
+        Input:
+          * sequence of integer numerators num = [a_0, a_1, ...]
+          * sequence of integer denominators denom = [b_0, b_1, ...]
+            (defaults to all ones)
+        '''
+        num = _as_column(num)
+        if denom is None:
+            denom = np.ones(len(num), dtype=num.dtype)
+        denom = _as_column(denom)
+        if not (num.shape == denom.shape):
+            raise ValueError("Numerators and denominators must have the same length.")
+        if (num.dtype == object) or (denom.dtype == object):
+            num, denom = _widen(num, denom)
+        if np.any(denom == 0):
+            raise ZeroDivisionError("Denominator must not be zero.")
+        self.num, self.denom = _simplify_columns(num, denom)
+
+    def from_list(qs):
+        '''Create a RationalArray from a list [[a_0, b_0], [a_1, b_1], ...]'''
+        num = [q[0] for q in qs]
+        denom = [q[1] for q in qs]
+        return RationalArray(num, denom)
+
+    def to_list(self):
+        '''Convert to a list [[a_0, b_0], [a_1, b_1], ...] of Python integers'''
+        return [[int(a), int(b)] for a, b in zip(self.num, self.denom)]
+
+    def __len__(self):
+        return len(self.num)
+
+    def __getitem__(self, j):
+        '''Return entry j as a rational number [a_j, b_j]'''
+        return [int(self.num[j]), int(self.denom[j])]
+
+    def __str__(self):
+        return '[' + ', '.join(str(to_str(q)) for q in self.to_list()) + ']'
+
+    def __repr__(self):
+        return 'RationalArray(' + str(self) + ')'
+
+    def _from_columns(num, denom):
+        '''Wrap already simplified columns without copying'''
+        r = RationalArray.__new__(RationalArray)
+        r.num = num
+        r.denom = denom
+        return r
+
+    def _coerce(self, q):
+        '''Convert q into a RationalArray of the same length as self'''
+        if isinstance(q, RationalArray):
+            if not (len(q) == len(self)):
+                raise ValueError("RationalArrays must have the same length.")
+            return q
+        elif isinstance(q, numbers.Integral):
+            return RationalArray(np.full(len(self), int(q), dtype=object), None)
+        else:
+            num, denom = q
+            return RationalArray(np.full(len(self), num, dtype=object),
+                                 np.full(len(self), denom, dtype=object))
+
+    def add(self, q):
+        '''Add element-wise
+
+        Input:
+          * RationalArray, rational number [c, d] or integer q
+
+        Output:
+          * RationalArray r with r_j = self_j + q_j
+        '''
+        q = self._coerce(q)
+        a, b, c, d = self.num, self.denom, q.num, q.denom
+        if not _fits_int64(a, b, c, d):
+            a, b, c, d = _widen(a, b, c, d)
+        num, denom = _simplify_columns(a*d + c*b, b*d)
+        return RationalArray._from_columns(num, denom)
+
+    def mul(self, q):
+        '''Multiply element-wise
+
+        Input:
+          * RationalArray, rational number [c, d] or integer q
+
+        Output:
+          * RationalArray r with r_j = self_j * q_j
+        '''
+        q = self._coerce(q)
+        a, b, c, d = self.num, self.denom, q.num, q.denom
+        if not _fits_int64(a, b, c, d):
+            a, b, c, d = _widen(a, b, c, d)
+        num, denom = _simplify_columns(a*c, b*d)
+        return RationalArray._from_columns(num, denom)
+
+    def neg(self):
+        '''Return RationalArray r with r_j = -self_j'''
+        num = self.num
+        if not _fits_int64(num):
+            num = num.astype(object)
+        return RationalArray._from_columns(-num, self.denom.copy())
+
+    def inverse(self):
+        '''Return RationalArray r with r_j = 1 / self_j'''
+        if np.any(self.num == 0):
+            raise ZeroDivisionError("Can not invert zero.")
+        return RationalArray._from_columns(self.denom.copy(), self.num.copy())
+
+    def __add__(self, q):
+        return self.add(q)
+
+    def __radd__(self, q):
+        return self.add(q)
+
+    def __mul__(self, q):
+        return self.mul(q)
+
+    def __rmul__(self, q):
+        return self.mul(q)
+
+    def __neg__(self):
+        return self.neg()
+
+    def __sub__(self, q):
+        return self.add(self._coerce(q).neg())
+
+def _simplify_columns(num, denom):
+    '''Cancel common factors of all entries with a single vectorised gcd
+
+    This is the array version of _simplify_rational(). Columns of dtype object
+    are converted back to int64 if all entries fit.
+    '''
+    g = np.gcd(num, denom)
+    num = num // g
+    denom = denom // g
+    if (num.dtype == object) and _fits_int64(num, denom):
+        num = num.astype(np.int64)
+        denom = denom.astype(np.int64)
+    return num, denom
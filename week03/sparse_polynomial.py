@@ -0,0 +1,128 @@
+'''Algebra of sparse rational polynomials
+
+Polynomials of high degree with only a few non-zero terms, such as
+x^100000 + 1, are stored as dictionaries {exponent: [num, denom]} which only
+contain the non-zero coefficients. The zero polynomial is the empty
+dictionary. Memory and run time of all functions in this module scale with the
+number of terms rather than the degree.
+
+All functions accept polynomials in the dense list format of polynomial.py or
+in the sparse format. Results are returned in the dense format if at least a
+fraction FILL_RATIO of the coefficients is non-zero and in the sparse format
+otherwise.
+'''
+
+import rational
+
+# Minimal fraction of non-zero coefficients for which the dense format is used
+FILL_RATIO = 0.5
+
+def from_dense(p):
+    '''Convert dense polynomial [[num, denom], ...] to sparse format'''
+    return {j: c for j, c in enumerate(p) if not (c[0] == 0)}
+
+def to_dense(p):
+    '''Convert sparse polynomial to dense format [[num, denom], ...]'''
+    if isinstance(p, list):
+        return p
+    if len(p) == 0:
+        return [[0,1],]
+    r = [[0,1] for j in range(max(p)+1)]
+    for j, c in p.items():
+        r[j] = c
+    return r
+
+def _as_sparse(p):
+    '''Return polynomial p in sparse format'''
+    if isinstance(p, dict):
+        return p
+    else:
+        return from_dense(p)
+
+def fill_ratio(p):
+    '''Fraction of non-zero coefficients of the polynomial p'''
+    p = _as_sparse(p)
+    if len(p) == 0:
+        return 1.0
+    return len(p) / (max(p)+1)
+
+def auto(p):
+    '''Return p in the dense or sparse format, depending on its fill ratio'''
+    if fill_ratio(p) >= FILL_RATIO:
+        return to_dense(p)
+    else:
+        return _as_sparse(p)
+
+def degree(p):
+    '''Degree of p, the zero polynomial has degree 0 as in polynomial.py'''
+    p = _as_sparse(p)
+    if len(p) == 0:
+        return 0
+    return max(p)
+
+def add(p,q):
+    '''add two polynomials p(x), q(x) with rational coefficients'''
+    p = _as_sparse(p)
+    q = _as_sparse(q)
+    r = dict(p)
+    for j, c in q.items():
+        if j in r:
+            s = rational.add(r[j],c)
+            if s[0] == 0:
+                del r[j]
+            else:
+                r[j] = s
+        else:
+            r[j] = c
+    return auto(r)
+
+def mul(p,q):
+    '''multiply two polynomials p(x), q(x) with rational coefficients'''
+    p = _as_sparse(p)
+    q = _as_sparse(q)
+    r = {}
+    for j, c in p.items():
+        for k, d in q.items():
+            cd = rational.mul(c,d)
+            if j+k in r:
+                r[j+k] = rational.add(r[j+k],cd)
+            else:
+                r[j+k] = cd
+    return auto({j: c for j, c in r.items() if not (c[0] == 0)})
+
+def evaluate(p,x):
+    '''Evaluate polynomial for a given rational number x
+
+    Horner's rule is applied to the non-zero terms only. The gap between two
+    consecutive exponents is bridged with a single power x^gap.
+    '''
+    p = _as_sparse(p)
+    if len(p) == 0:
+        return [0,1]
+    exponents = sorted(p, reverse=True)
+    q = p[exponents[0]]
+    for e_prev, e in zip(exponents, exponents[1:]):
+        q = rational.add(p[e],rational.mul(_power(x,e_prev-e),q))
+    return rational.mul(_power(x,exponents[-1]),q)
+
+def _power(x,n):
+    '''Compute x^n for a rational number x and integer n >= 0'''
+    num, denom = x
+    return [num**n,denom**n]
+
+def integrate(p):
+    '''integrate a polynomial'''
+    p = _as_sparse(p)
+    return auto({j+1: rational.mul([1,j+1],c) for j, c in p.items()})
+
+def to_str(p):
+    '''Convert to string representation'''
+    p = _as_sparse(p)
+    if len(p) == 0:
+        return rational.to_str([0,1])
+    if max(p) == 0:
+        return rational.to_str(p[0])
+    s = ''
+    for j in sorted(p):
+        s += ' + ('+rational.to_str(p[j])+') * x^'+str(j)
+    return s
@@ -0,0 +1,187 @@
+'''Accurate summation of floating point and rational numbers
+
+Floating point addition is not associative, e.g. (1e16 + -1e16) + 1 == 1 but
+1e16 + (-1e16 + 1) == 0, so the result of a long sum depends on the order in
+which the terms are added. This module provides four summation methods with a
+common interface:
+
+ * 'pairwise': add the terms in a balanced binary tree (as numpy.sum does),
+   the rounding error grows like log(n) instead of n
+ * 'kahan': Kahan-Babuska-Neumaier compensated summation, the rounding error
+   of every addition is accumulated separately and added at the end
+ * 'fsum': the correctly rounded float result of math.fsum
+ * 'rational': the exact sum as a rational number [a, b] (see rational.py)
+
+All methods can be used in streaming mode: the terms are passed in chunks
+(NumPy arrays or lists) to RunningSum.add(), so that data sets which do not
+fit into memory can be summed chunk by chunk.
+'''
+import math
+import numpy as np
+import rational
+
+METHODS = ('pairwise', 'kahan', 'fsum', 'rational')
+
+def total(xs, method='pairwise'):
+    '''Sum a sequence of numbers
+
+    Input:
+      * xs = NumPy array or list of floats; for method='rational' also a list
+        of rational numbers [[a_0, b_0], [a_1, b_1], ...] or a RationalArray
+      * method = one of METHODS
+
+    Output:
+      * sum of xs as a float, or as a rational number [a, b] for method='rational'
+    '''
+    return sum_chunks([xs], method)
+
+def sum_chunks(chunks, method='pairwise'):
+    '''Sum all terms of an iterable of chunks, e.g. a generator of NumPy arrays
+
+    See total() for the input and output.
+    '''
+    s = RunningSum(method)
+    for chunk in chunks:
+        s.add(chunk)
+    return s.result()
+
+class RunningSum(object):
+    '''Sum of a stream of chunks of numbers
+
+    Example:
+
+    s = RunningSum('kahan')
+    for chunk in chunks:
+        s.add(chunk)
+    print(s.result())
+    '''
+
+    def __init__(self, method='pairwise'):
+        if method not in METHODS:
+            raise ValueError("Unknown summation method " + repr(method) + ", expected one of " + str(METHODS))
+        self.method = method
+        # pairwise: partial sums [(number of chunks, sum), ...] with decreasing numbers of chunks
+        self._levels = []
+        # kahan: running sum and accumulated compensation
+        self._s = 0.0
+        self._c = 0.0
+        # fsum: floats whose exact sum is the exact sum of all terms so far
+        self._partials = []
+        # rational: exact sum so far
+        self._q = [0,1]
+
+    def add(self, chunk):
+        '''Add all terms of the chunk to the sum'''
+        getattr(self, '_add_' + self.method)(chunk)
+
+    def result(self):
+        '''Return the sum of all terms added so far'''
+        if self.method == 'pairwise':
+            s = 0.0
+            for count, value in reversed(self._levels):
+                s = s + value
+            return s
+        elif self.method == 'kahan':
+            if not math.isfinite(self._s):
+                return self._s
+            return self._s + self._c
+        elif self.method == 'fsum':
+            return math.fsum(self._partials)
+        else:
+            return list(self._q)
+
+    def _add_pairwise(self, chunk):
+        # numpy.sum adds contiguous float arrays pairwise; the chunk sums are
+        # combined like the digits of a binary counter, so that the whole
+        # stream is summed in a balanced tree of chunks as well
+        x = _as_floats(chunk)
+        levels = self._levels
+        levels.append((1, float(np.sum(x))))
+        while (len(levels) >= 2) and (levels[-1][0] == levels[-2][0]):
+            count, b = levels.pop()
+            count, a = levels.pop()
+            levels.append((2*count, a + b))
+
+    def _add_kahan(self, chunk):
+        # numpy.cumsum adds sequentially, so it computes exactly the running
+        # sums t_k = fl(t_{k-1} + x_k) of the Neumaier loop. The rounding error
+        # of each addition is then recovered exactly (Knuth's two-sum) in one
+        # vectorised step, instead of one Python operation per term.
+        x = _as_floats(chunk)
+        if len(x) == 0:
+            return
+        t = np.cumsum(np.concatenate(([self._s], x)))
+        prev, t = t[:-1], t[1:]
+        with np.errstate(invalid='ignore'):
+            errors = np.where(np.abs(prev) >= np.abs(x), (prev - t) + x, (x - t) + prev)
+        self._c += float(np.sum(errors))
+        self._s = float(t[-1])
+
+    def _add_fsum(self, chunk):
+        # math.fsum only returns the rounded sum. The exact sum is carried over
+        # to the next chunk as a short list of floats hi_0 + hi_1 + ...: each
+        # hi_k is the rounded remainder after subtracting hi_0, ..., hi_{k-1}.
+        values = _as_floats(chunk).tolist() + self._partials
+        partials = []
+        while True:
+            hi = math.fsum(values)
+            if hi == 0:
+                break
+            partials.append(hi)
+            if not math.isfinite(hi):
+                break
+            values.append(-hi)
+        self._partials = partials
+
+    def _add_rational(self, chunk):
+        self._q = rational.add(self._q, _sum_rational_array(_as_rational_array(chunk)))
+
+def _as_floats(chunk):
+    '''Contiguous one-dimensional float64 array'''
+    return np.ascontiguousarray(chunk, dtype=np.float64).reshape(-1)
+
+def _as_rational_array(chunk):
+    '''Convert a RationalArray, a list of rational numbers [a, b] or an
+    array of floats into a RationalArray (floats are converted exactly)'''
+    if isinstance(chunk, rational.RationalArray):
+        return chunk
+    if (len(chunk) > 0) and isinstance(chunk[0], (list, tuple)):
+        return rational.RationalArray.from_list(chunk)
+    x = _as_floats(chunk)
+    if not np.all(np.isfinite(x)):
+        raise ValueError("Can not convert inf or nan to a rational number.")
+    # x = m * 2^(e - 53) with an integer mantissa |m| < 2^53
+    m, e = np.frexp(x)
+    m = (m * 2.0**53).astype(np.int64)
+    shift = 53 - e.astype(np.int64)
+    if (len(x) == 0) or (np.min(shift) >= 0 and np.max(shift) <= 62):
+        return rational.RationalArray(m, np.left_shift(np.int64(1), shift))
+    return rational.RationalArray.from_list([v.as_integer_ratio() for v in x.tolist()])
+
+def _sum_rational_array(q):
+    '''Exact sum [a, b] of all entries of a RationalArray by binary splitting
+
+    Neighbouring entries are added level by level in a balanced binary tree.
+    Each level is a single RationalArray.add(), so the fractions are reduced
+    with one vectorised gcd per level instead of one gcd per term, and the
+    numbers only become large near the root of the tree.
+    '''
+    if len(q) == 0:
+        return [0,1]
+    num, denom = q.num, q.denom
+    while len(num) > 1:
+        odd = None
+        if len(num) % 2 == 1:
+            odd = (num[-1:], denom[-1:])
+            num, denom = num[:-1], denom[:-1]
+        left = rational.RationalArray._from_columns(num[0::2], denom[0::2])
+        right = rational.RationalArray._from_columns(num[1::2], denom[1::2])
+        s = left.add(right)
+        num, denom = s.num, s.denom
+        if odd is not None:
+            if (num.dtype == object) or (odd[0].dtype == object):
+                num, denom = num.astype(object), denom.astype(object)
+                odd = (odd[0].astype(object), odd[1].astype(object))
+            num = np.concatenate((num, odd[0]))
+            denom = np.concatenate((denom, odd[1]))
+    return [int(num[0]), int(denom[0])]
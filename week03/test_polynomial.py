@@ -1,4 +1,6 @@
+import numpy as np
 import polynomial
+import rational
 
 def test_add_zero():
     '''Check that adding zero does not change polynomial'''
@@ -100,3 +102,57 @@ def test_integrate_quadratic():
     '''Check that integrating a quadratic polynomial works'''
     p = [[1,3],[-2,5],[4,7]]
     assert polynomial.integrate(p) == [[0,1],[1,3],[-1,5],[4,21]]
+
+def test_mul_kronecker_schoolbook():
+    '''Check that the fast multiplication agrees with the schoolbook method'''
+    p = [[(-1)**j*(j+1),j%7+1] for j in range(40)]
+    q = [[3*j-50,2*j+1] for j in range(25)]
+    assert polynomial.mul(p,q) == polynomial._mul_schoolbook(p,q)
+
+def test_evaluate_many_exact():
+    '''Check that evaluation at many points agrees with evaluate'''
+    p = [[1,3],[5,7],[2,9]]
+    xs = [[2,5],[-1,1],[0,1],[7,3]]
+    assert polynomial.evaluate_many(p,xs) == [polynomial.evaluate(p,x) for x in xs]
+
+def test_evaluate_many_float():
+    '''Check that float evaluation agrees with the exact values'''
+    p = [[1,3],[5,7],[2,9]]
+    y = polynomial.evaluate_many(p,[0.4,-1.0],mode='float')
+    assert abs(y[0]-1031/1575) < 1e-14
+    assert abs(y[1]-(1/3-5/7+2/9)) < 1e-14
+
+def test_shift_quadratic():
+    '''Check that shifting x^2 + 2x + 1 by 1 gives x^2 + 4x + 4'''
+    p = [[1,1],[2,1],[1,1]]
+    assert polynomial.shift(p,[1,1]) == [[4,1],[4,1],[1,1]]
+
+def test_shift_evaluate():
+    '''Check that p(x + a) evaluated at x agrees with p evaluated at x + a'''
+    p = [[1,3],[5,7],[2,9],[-1,4]]
+    a = [2,5]
+    x = [-3,7]
+    assert polynomial.evaluate(polynomial.shift(p,a),x) == polynomial.evaluate(p,rational.add(x,a))
+
+def test_compose_evaluate():
+    '''Check that p(q(x)) evaluated at x agrees with p evaluated at q(x)'''
+    p = [[1,4],[-5,6],[0,1],[1,4],[0,1],[2,7]]
+    q = [[2,9],[-2,7],[1,6]]
+    x = [3,5]
+    assert polynomial.evaluate(polynomial.compose(p,q),x) == polynomial.evaluate(p,polynomial.evaluate(q,x))
+
+def test_evaluate_many_float_grid():
+    '''Check that a 2-D array of float points is evaluated element-wise'''
+    p = [[0,1],[1,1],[1,1]]
+    xs = np.array([[0.5,2.],[1.,3.]])
+    assert np.allclose(polynomial.evaluate_many(p,xs,mode='float'), xs + xs**2)
+
+def test_evaluate_many_float_pairs():
+    '''Check that a list of rational numbers is converted to floats'''
+    p = [[0,1],[1,1]]
+    assert np.allclose(polynomial.evaluate_many(p,[[1,2],[1,3]],mode='float'), [0.5,1/3])
+
+def test_evaluate_many_int64_min():
+    '''Check exact evaluation at -2**63 beyond the int64 range'''
+    p = [[0,1],[0,1],[1,1]]
+    assert polynomial.evaluate_many(p,[[-2**63,1]]) == [[2**126,1]]
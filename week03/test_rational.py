@@ -1,3 +1,4 @@
+import numpy as np
 import rational
 
 def test_add_rational():
@@ -14,3 +15,56 @@ def test_mul_rational():
 def test_mul_int_rational():
     '''Check that 10 * 7/15 == 14/3'''
     assert rational.mul_int(10,[7,15]) == [14,3]
+
+def test_rational_array_roundtrip():
+    '''Check that conversion to and from lists simplifies every entry'''
+    qs = [[2,4],[3,9],[-10,15]]
+    assert rational.RationalArray.from_list(qs).to_list() == [[1,2],[1,3],[-2,3]]
+
+def test_rational_array_add():
+    '''Check that element-wise addition agrees with rational.add'''
+    p = [[1,2],[3,5],[-4,7]]
+    q = [[3,5],[1,4],[2,9]]
+    r = rational.RationalArray.from_list(p) + rational.RationalArray.from_list(q)
+    assert r.to_list() == [rational.add(a,b) for a,b in zip(p,q)]
+
+def test_rational_array_mul():
+    '''Check that element-wise multiplication agrees with rational.mul'''
+    p = [[3,2],[10,1],[-4,7]]
+    q = [[4,5],[7,15],[2,9]]
+    r = rational.RationalArray.from_list(p) * rational.RationalArray.from_list(q)
+    assert r.to_list() == [rational.mul(a,b) for a,b in zip(p,q)]
+
+def test_rational_array_neg_inverse():
+    '''Check that -(1/q) == -1/q element-wise'''
+    q = rational.RationalArray.from_list([[2,3],[5,7]])
+    assert (-q.inverse()).to_list() == [[-3,2],[-7,5]]
+
+def test_rational_array_overflow():
+    '''Check that products beyond int64 are computed exactly'''
+    big = 2**40+1
+    q = rational.RationalArray([big, 3], [1, 2**40])
+    r = q * q
+    assert r.to_list() == [[big**2,1],[9,2**80]]
+    assert (r * q.inverse()).to_list() == q.to_list()
+
+def test_rational_array_rejects_floats():
+    '''Check that float entries raise a TypeError instead of being truncated'''
+    for num in [[1.5, 2.7], np.array([1.5, 2.7])]:
+        try:
+            rational.RationalArray(num)
+        except TypeError:
+            continue
+        assert False
+
+def test_rational_array_numpy_integers():
+    '''Check that NumPy integer arrays and scalars are accepted'''
+    q = rational.RationalArray(np.array([1, 2], dtype=np.int32), [2**63, 3])
+    assert q.to_list() == [[1,2**63],[2,3]]
+    assert (q + np.int64(1)).to_list() == [[2**63+1,2**63],[5,3]]
+
+def test_rational_array_int64_min():
+    '''Check that -2**63 is not mistaken for a small entry'''
+    q = rational.RationalArray([-2**63, 5], [3, 7])
+    assert (q * q).to_list() == [[2**126,9],[25,49]]
+    assert (-q).to_list() == [[2**63,3],[-5,7]]
@@ -0,0 +1,52 @@
+import polynomial
+import sparse_polynomial
+
+def test_dense_roundtrip():
+    '''Check that converting to sparse format and back does not change polynomial'''
+    p = [[1,4],[0,1],[0,1],[2,7]]
+    assert sparse_polynomial.to_dense(sparse_polynomial.from_dense(p)) == p
+
+def test_auto_sparse():
+    '''Check that x^100000 + 1 is stored with two terms'''
+    p = sparse_polynomial.add({100000: [1,1]}, [[1,1],])
+    assert p == {0: [1,1], 100000: [1,1]}
+
+def test_auto_dense():
+    '''Check that a polynomial without zero terms is returned in dense format'''
+    p = [[1,3],[-4,7]]
+    q = [[2,9],[1,4],[2,3]]
+    assert sparse_polynomial.add(p,q) == polynomial.add(p,q)
+
+def test_add_cancel():
+    '''Check that adding p and -p gives the zero polynomial'''
+    p = {5: [1,3], 1000: [-2,7]}
+    q = {5: [-1,3], 1000: [2,7]}
+    assert sparse_polynomial.add(p,q) == [[0,1],]
+
+def test_mul_dense():
+    '''Check that multiplication agrees with polynomial.mul'''
+    p = [[1,4],[-5,6],[0,1],[1,4],[0,1],[2,7]]
+    q = [[2,9],[-2,7],[1,6],[0,1],[-9,23]]
+    r = sparse_polynomial.mul(p,q)
+    assert sparse_polynomial.to_dense(r) == polynomial.mul(p,q)
+
+def test_mul_sparse():
+    '''Check that (x^1000 + 1)(x^1000 - 1) == x^2000 - 1'''
+    p = {0: [1,1], 1000: [1,1]}
+    q = {0: [-1,1], 1000: [1,1]}
+    assert sparse_polynomial.mul(p,q) == {0: [-1,1], 2000: [1,1]}
+
+def test_evaluate():
+    '''Check that evaluation agrees with polynomial.evaluate'''
+    p = [[1,3],[0,1],[0,1],[5,7],[0,1],[2,9]]
+    x = [2,5]
+    assert sparse_polynomial.evaluate(p,x) == polynomial.evaluate(p,x)
+
+def test_integrate():
+    '''Check that integrating x^999 gives x^1000 / 1000'''
+    assert sparse_polynomial.integrate({999: [1,1]}) == {1000: [1,1000]}
+
+def test_to_str():
+    '''Check that string representation agrees with polynomial.to_str'''
+    p = [[1,3],[0,1],[5,7]]
+    assert sparse_polynomial.to_str(sparse_polynomial.from_dense(p)) == polynomial.to_str(p)
@@ -0,0 +1,35 @@
+import numpy as np
+import rational
+import summation
+
+def test_cancellation():
+    '''Check that 1 + 1e16 - 1e16 == 1 for the accurate methods'''
+    xs = [1.0, 1e16, -1e16]
+    assert summation.total(xs, 'kahan') == 1.0
+    assert summation.total(xs, 'fsum') == 1.0
+    assert summation.total(xs, 'rational') == [1,1]
+
+def test_rational_sum():
+    '''Check that 1 + 1/2 + ... + 1/2^15 agrees with folding rational.add'''
+    qs = [[1,2**k] for k in range(16)]
+    q = [0,1]
+    for p in qs:
+        q = rational.add(q,p)
+    assert summation.total(qs, 'rational') == q
+
+def test_rational_floats_exact():
+    '''Check that 0.1 + 0.2 is summed exactly as binary fractions'''
+    assert summation.total([0.1, 0.2], 'rational') == [10808639105689191, 36028797018963968]
+
+def test_streaming_fsum():
+    '''Check that summing in chunks gives the correctly rounded sum of all terms'''
+    xs = np.array([1e100, 1.0, -1e100, 1e-100] * 5)
+    assert summation.sum_chunks(np.array_split(xs, 7), 'fsum') == 5.0
+
+def test_streaming_agrees():
+    '''Check that all float methods agree with the exact sum on random chunks'''
+    xs = np.random.default_rng(1).standard_normal(10000)
+    exact = summation.total(xs, 'rational')
+    for method in ['pairwise', 'kahan', 'fsum']:
+        s = summation.sum_chunks(np.array_split(xs, 13), method)
+        assert abs(s - exact[0]/exact[1]) < 1e-10
@@ -0,0 +1,147 @@
+import timeit
+
+import numpy as np
+
+# FFT multiplication is used if both factors have at least this many
+# coefficients. The value is the crossover measured with tune_crossover().
+FFT_CROSSOVER = 512
+
+
+class FloatPolynomial(object):
+    '''Polynomials c_0 + c_1 x + ... + c_n x^n with float64 coefficients
+
+    The coefficients are stored in a NumPy array coeffs (lowest degree first).
+    Multiplication uses direct convolution for small polynomials and the FFT
+    for large ones (see FFT_CROSSOVER).
+
+    Error bound of the FFT multiplication: with N >= deg p + deg q + 1 the FFT
+    length and eps = 2^-53 the unit roundoff, every coefficient of the computed
+    product differs from the exact one by at most about
+
+        5 * log2(N) * eps * ||p||_2 * ||q||_2
+
+    where ||p||_2 is the Euclidean norm of the coefficient vector of p (see
+    fft_error_bound()). In contrast to direct convolution the error is not
+    relative to each coefficient: coefficients which are much smaller than
+    the largest ones lose relative accuracy.
+    '''
+
+    def __init__(self, coeffs):
+        '''Creates a FloatPolynomial from a list or array of coefficients'''
+        self.coeffs = np.array(coeffs, dtype=np.float64, ndmin=1)
+
+    def _wrap(c):
+        '''Creates a FloatPolynomial which owns the array c without copying it'''
+        p = FloatPolynomial.__new__(FloatPolynomial)
+        p.coeffs = c
+        return p
+
+    def degree(self):
+        return len(self.coeffs) - 1
+
+    def __str__(self):
+        '''Returns a string representation, highest degree first'''
+        s = ''
+        for j in range(len(self.coeffs) - 1, -1, -1):
+            s += ' + (' + str(self.coeffs[j]) + ') * x^' + str(j)
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    def __call__(self, x):
+        '''Evaluates the polynomial at x (a number or an array) with Horner's rule'''
+        x = np.asarray(x, dtype=np.float64)
+        y = np.full(x.shape, self.coeffs[-1])
+        for c in self.coeffs[-2::-1]:
+            y *= x
+            y += c
+        return y if y.ndim > 0 else float(y)
+
+    def __add__(self, q):
+        if not isinstance(q, FloatPolynomial):
+            r = self.coeffs.copy()
+            r[0] += q
+            return FloatPolynomial._wrap(r)
+        a, b = self.coeffs, q.coeffs
+        if len(a) < len(b):
+            a, b = b, a
+        r = a.copy()
+        r[:len(b)] += b
+        return FloatPolynomial._wrap(r)
+
+    def __radd__(self, q):
+        return self + q
+
+    def __neg__(self):
+        return FloatPolynomial._wrap(-self.coeffs)
+
+    def __sub__(self, q):
+        return self + (-q)
+
+    def __rsub__(self, q):
+        return (-self) + q
+
+    def __mul__(self, q):
+        if not isinstance(q, FloatPolynomial):
+            return FloatPolynomial._wrap(self.coeffs * q)
+        return FloatPolynomial._wrap(multiply(self.coeffs, q.coeffs))
+
+    def __rmul__(self, q):
+        return self * q
+
+    def __truediv__(self, c):
+        return FloatPolynomial._wrap(self.coeffs / c)
+
+    def derivative(self):
+        '''Returns the derivative p'(x)'''
+        if len(self.coeffs) == 1:
+            return FloatPolynomial([0.0])
+        return FloatPolynomial._wrap(self.coeffs[1:] * np.arange(1, len(self.coeffs)))
+
+    def integral(self, c=0.0):
+        '''Returns the antiderivative P(x) with P(0) = c'''
+        r = np.empty(len(self.coeffs) + 1)
+        r[0] = c
+        np.divide(self.coeffs, np.arange(1, len(self.coeffs) + 1), out=r[1:])
+        return FloatPolynomial._wrap(r)
+
+
+def multiply(a, b):
+    '''Coefficients of the product of the polynomials with coefficients a and b'''
+    if min(len(a), len(b)) < FFT_CROSSOVER:
+        return np.convolve(a, b)
+    return multiply_fft(a, b)
+
+
+def multiply_fft(a, b):
+    '''Multiply polynomials with the real FFT in O(N log N), N = len(a)+len(b)-1'''
+    n = len(a) + len(b) - 1
+    N = 1 << (n - 1).bit_length()
+    return np.fft.irfft(np.fft.rfft(a, N) * np.fft.rfft(b, N), N)[:n]
+
+
+def fft_error_bound(a, b):
+    '''Bound for the largest coefficient error of multiply_fft(a, b)'''
+    N = 1 << (len(a) + len(b) - 2).bit_length()
+    eps = np.finfo(np.float64).eps / 2
+    return 5 * max(np.log2(N), 1) * eps * np.linalg.norm(a) * np.linalg.norm(b)
+
+
+def tune_crossover(sizes=(32, 64, 128, 256, 512, 1024, 2048), number=50):
+    '''Time direct and FFT multiplication of two polynomials of equal size
+
+    Prints the timings and returns the smallest size for which the FFT was
+    faster (a suitable value for FFT_CROSSOVER).
+    '''
+    rng = np.random.default_rng(0)
+    crossover = None
+    for n in sizes:
+        a = rng.standard_normal(n)
+        b = rng.standard_normal(n)
+        t_direct = min(timeit.repeat(lambda: np.convolve(a, b), number=number, repeat=3))
+        t_fft = min(timeit.repeat(lambda: multiply_fft(a, b), number=number, repeat=3))
+        print('%6d  direct %.2e s  fft %.2e s' % (n, t_direct / number, t_fft / number))
+        if (crossover is None) and (t_fft < t_direct):
+            crossover = n
+    return crossover
@@ -22,6 +22,8 @@ class LinearFunction(object):
     
     def __add__(self, g):
         '''Returns the sum of two LinearFunctions'''
+        if isinstance(g, LinearFunctionArray):
+            return g + self
         r = LinearFunction(self.a + g.a, self.b + g.b)
         return r
 
@@ -40,4 +42,87 @@ class LinearFunction(object):
         lst = []
         for i in range(n):
             lst.append(LinearFunction.random())    
-        return lst
\ No newline at end of file
+        return lst
+
+class LinearFunctionArray(object):
+    '''Array of n linear functions a_j x + b_j on R
+
+    All slopes a_j and intercepts b_j are stored in two contiguous float64
+    arrays a and b instead of n separate LinearFunction objects.
+    '''
+
+    def __init__(self, a, b):
+        '''Creates a LinearFunctionArray from arrays of slopes a and intercepts b
+
+        The values are copied, so that scale() does not change the caller's arrays.
+        '''
+        self.a = np.array(a, dtype=np.float64)
+        self.b = np.array(b, dtype=np.float64)
+        if not (self.a.shape == self.b.shape) or not (self.a.ndim == 1):
+            raise ValueError('a and b must be one-dimensional arrays of the same length')
+
+    def _view(a, b):
+        '''Creates a LinearFunctionArray which shares the arrays a and b'''
+        r = LinearFunctionArray.__new__(LinearFunctionArray)
+        r.a = a
+        r.b = b
+        return r
+
+    def from_list(lst):
+        '''Creates a LinearFunctionArray from a list of LinearFunctions'''
+        return LinearFunctionArray([f.a for f in lst], [f.b for f in lst])
+
+    def to_list(self):
+        '''Returns a list of LinearFunctions'''
+        return [LinearFunction(a, b) for a, b in zip(self.a.tolist(), self.b.tolist())]
+
+    def random(n):
+        '''Returns a LinearFunctionArray of n random LinearFunctions'''
+        return LinearFunctionArray._view(np.random.random(n), np.random.random(n))
+
+    def __len__(self):
+        return len(self.a)
+
+    def __getitem__(self, j):
+        '''Returns a LinearFunction for an index j and a view for a slice j'''
+        if isinstance(j, slice):
+            return LinearFunctionArray._view(self.a[j], self.b[j])
+        return LinearFunction(float(self.a[j]), float(self.b[j]))
+
+    def __str__(self):
+        '''Returns a string representation of a LinearFunctionArray'''
+        return '[' + ', '.join(str(f) for f in self.to_list()) + ']'
+
+    def __repr__(self):
+        '''Returns a string representation of a LinearFunctionArray'''
+        return str(self)
+
+    def evaluate(self, x):
+        '''Evaluates all linear functions at x
+
+        For a number x the result is the array [f_0(x), ..., f_{n-1}(x)]. For an
+        array x of m points the result is the n x m array with entries f_j(x_k).
+        '''
+        if np.ndim(x) == 0:
+            return self.a*x + self.b
+        x = np.asarray(x, dtype=np.float64)
+        r = np.multiply.outer(self.a, x)
+        r += self.b.reshape((-1,) + (1,)*x.ndim)
+        return r
+
+    def __add__(self, g):
+        '''Returns the element-wise sum with a LinearFunctionArray or a LinearFunction'''
+        return LinearFunctionArray._view(self.a + g.a, self.b + g.b)
+
+    def __radd__(self, g):
+        '''Returns the element-wise sum with a LinearFunction'''
+        return self + g
+
+    def sum(self):
+        '''Returns the sum of all linear functions as a LinearFunction'''
+        return LinearFunction(float(self.a.sum()), float(self.b.sum()))
+
+    def scale(self, c):
+        '''Scales all linear functions by a factor c (a number or an array) in place'''
+        self.a *= c
+        self.b *= c
@@ -0,0 +1,50 @@
+'''Tests for polynomials with float64 coefficients'''
+import numpy as np
+import floatpolynomial
+from floatpolynomial import FloatPolynomial
+
+
+def test_multiply_fft_integers():
+    '''Check the FFT product against the exact np.convolve of integer coefficients'''
+    rng = np.random.default_rng(0)
+    a = rng.integers(-1000, 1000, 600).astype(float)
+    b = rng.integers(-1000, 1000, 700).astype(float)
+    error = np.max(np.abs(floatpolynomial.multiply_fft(a, b) - np.convolve(a, b)))
+    assert error <= floatpolynomial.fft_error_bound(a, b)
+
+
+def test_mul_above_crossover(monkeypatch):
+    '''Check that * uses the FFT above FFT_CROSSOVER and stays within the bound'''
+    calls = []
+    multiply_fft = floatpolynomial.multiply_fft
+
+    def spy(a, b):
+        calls.append(len(a))
+        return multiply_fft(a, b)
+    monkeypatch.setattr(floatpolynomial, 'multiply_fft', spy)
+    rng = np.random.default_rng(1)
+    n = floatpolynomial.FFT_CROSSOVER
+    a = rng.standard_normal(n)
+    b = rng.standard_normal(n + 3)
+    c = (FloatPolynomial(a) * FloatPolynomial(b)).coeffs
+    assert len(c) == 2*n + 2
+    assert calls == [n]
+    assert np.max(np.abs(c - np.convolve(a, b))) <= floatpolynomial.fft_error_bound(a, b)
+    assert (FloatPolynomial(a[:10]) * FloatPolynomial(b)).coeffs.tolist() == np.convolve(a[:10], b).tolist()
+    assert calls == [n]
+
+
+def test_call():
+    '''Check evaluation of 1 + 2x + 3x^2 at a number and at an array'''
+    p = FloatPolynomial([1, 2, 3])
+    assert p(2) == 17.0
+    assert isinstance(p(2), float)
+    assert p(np.array([[0.0, 1.0], [-1.0, 0.5]])).tolist() == [[1.0, 6.0], [2.0, 2.75]]
+
+
+def test_derivative_integral():
+    '''Check derivative and integral of 1 + 2x + 3x^2'''
+    p = FloatPolynomial([1, 2, 3])
+    assert p.derivative().coeffs.tolist() == [2.0, 6.0]
+    assert p.integral(5.0).coeffs.tolist() == [5.0, 1.0, 1.0, 1.0]
+    assert FloatPolynomial([4]).derivative().coeffs.tolist() == [0.0]
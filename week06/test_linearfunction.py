@@ -0,0 +1,50 @@
+'''Tests for linear functions and arrays of linear functions'''
+import numpy as np
+from linearfunction import LinearFunction, LinearFunctionArray
+
+
+def test_evaluate_shapes():
+    '''Check that evaluating at an array of points gives the outer-product shape'''
+    F = LinearFunctionArray([1, 2, 3], [0, 1, 2])
+    assert F.evaluate(2).tolist() == [2, 5, 8]
+    x = np.array([[0.0, 1.0], [2.0, 3.0]])
+    y = F.evaluate(x)
+    assert y.shape == (3, 2, 2)
+    assert y[1].tolist() == (2*x + 1).tolist()
+
+
+def test_add_linear_function():
+    '''Check adding a scalar LinearFunction on either side'''
+    F = LinearFunctionArray([1, 2], [3, 4])
+    g = LinearFunction(10, 20)
+    for r in [F + g, g + F]:
+        assert isinstance(r, LinearFunctionArray)
+        assert r.a.tolist() == [11, 12] and r.b.tolist() == [23, 24]
+
+
+def test_sum():
+    '''Check that sum() agrees with folding LinearFunction.__add__'''
+    lst = [LinearFunction(0.5*k, 1.0 - k) for k in range(10)]
+    total = lst[0]
+    for f in lst[1:]:
+        total = total + f
+    s = LinearFunctionArray.from_list(lst).sum()
+    assert (s.a, s.b) == (total.a, total.b)
+
+
+def test_slice_view_and_scale():
+    '''Check that slices share memory and see scale() in place'''
+    F = LinearFunctionArray([1, 2, 3, 4], [5, 6, 7, 8])
+    G = F[1:3]
+    assert np.shares_memory(G.a, F.a)
+    F.scale(2)
+    assert G.a.tolist() == [4, 6] and G.b.tolist() == [12, 14]
+
+
+def test_constructor_copies():
+    '''Check that scale() does not change the arrays passed to the constructor'''
+    a = np.array([1.0, 2.0])
+    b = np.array([3.0, 4.0])
+    F = LinearFunctionArray(a, b)
+    F.scale(10)
+    assert a.tolist() == [1.0, 2.0] and b.tolist() == [3.0, 4.0]
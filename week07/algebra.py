@@ -1,9 +1,13 @@
 '''The definitions of abstract classes Ring and Field from Lecture 18b have been provided here for the purpose of Tickable 14'''
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
 class Ring(ABC):
     '''Ring (A, +, ., zero, id)'''
     
+    # No per-instance __dict__ is needed here, so that subclasses may use __slots__
+    __slots__ = ()
+    
     @abstractmethod
     def __mul__(a,b):
         ...
@@ -39,21 +43,67 @@ class Ring(ABC):
     def __repr__(self):
         return str(self)
     
-    # Even if id() and __mul__() are not defined yet, we can define power in terms of these
+    # Even if id() and __mul__() are not defined yet, we can define power in terms of these.
+    # Square-and-multiply (as in model_solutions.fast_power) needs about 2*log2(n)
+    # multiplications: a^n is the product of the squares a^(2^k) for all bits k of n.
     def __pow__(a, n):
+        if not isinstance(n, int):
+            # e.g. a**2.0 is allowed, but not a**2.5
+            if not (n == int(n)):
+                raise ValueError("Only integer powers are defined.")
+            n = int(n)
         if (n==0):
             return a.__class__.id()
-        else:
-            return a * (a**(n-1))
+        elif (n<0):
+            if not isinstance(a, Field):
+                raise ValueError("Negative powers are only defined in a Field.")
+            return a.inv()**(-n)
+        squares = _repeated_squares(a, n.bit_length())
+        r = None
+        for k in range(n.bit_length()):
+            if (n >> k) & 1:
+                r = squares[k] if r is None else r*squares[k]
+        return r
+    
+    # Set power_cache_size to a positive number in a subclass with immutable,
+    # hashable elements to remember the squares a^(2^k) of the most recently
+    # used bases, so that repeated powers of the same base are cheaper.
+    power_cache_size = 0
         
 
 class Field(Ring):
     '''Field (A, +, ., zero, id)'''
     
+    __slots__ = ()
+    
     @abstractmethod
     def inv(a):
         ...
         
     # Even if inv() is not defined yet, and __mul__() is inherited but not defined, we can still define a/b = a * (b.inv())
     def __truediv__(a,b):
-        return a*(b.inv())
\ No newline at end of file
+        return a*(b.inv())
+
+
+# For each class with power_cache_size > 0: OrderedDict base -> [a, a^2, a^4, ...]
+_power_caches = {}
+
+def _repeated_squares(a, m):
+    '''Return the list [a, a^2, a^4, ..., a^(2^(m-1))]'''
+    cls = a.__class__
+    size = cls.power_cache_size
+    if size > 0:
+        cache = _power_caches.setdefault(cls, OrderedDict())
+        squares = cache.get(a)
+        if squares is None:
+            squares = [a]
+            cache[a] = squares
+            if len(cache) > size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(a)
+    else:
+        squares = [a]
+    while len(squares) < m:
+        squares.append(squares[-1]*squares[-1])
+    return squares
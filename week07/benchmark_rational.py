@@ -0,0 +1,39 @@
+'''Benchmark of rational number classes
+
+Compares rationalnormalized.Rational with fractions.Fraction and the original
+rationalclass.Rational on long sums and products. Run with
+
+python benchmark_rational.py
+'''
+import timeit
+from fractions import Fraction
+import rationalclass
+import rationalnormalized
+
+def harmonic_sum(cls, n):
+    '''Compute 1 + 1/2 + ... + 1/n'''
+    s = cls(0, 1)
+    for k in range(1, n+1):
+        s = s + cls(1, k)
+    return s
+
+def telescoping_product(cls, n):
+    '''Compute (2/1) * (3/2) * ... * ((n+1)/n) = n+1'''
+    p = cls(1, 1)
+    for k in range(1, n+1):
+        p = p * cls(k+1, k)
+    return p
+
+def run(n=2000, number=3):
+    '''Print the run time of each class for sums and products of n terms'''
+    classes = [('fractions.Fraction', Fraction),
+               ('rationalnormalized.Rational', rationalnormalized.Rational),
+               ('rationalclass.Rational', rationalclass.Rational)]
+    for name, f in [('sum', harmonic_sum), ('product', telescoping_product)]:
+        print(f'{name} of {n} terms ({number} runs)')
+        for cls_name, cls in classes:
+            t = timeit.timeit(lambda: f(cls, n), number=number)
+            print(f'  {cls_name:30s} {t:10.4f} s')
+
+if __name__ == '__main__':
+    run()
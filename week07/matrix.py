@@ -0,0 +1,331 @@
+'''Dense matrices over a Ring
+
+The class Matrix generalises Mat2x2 from Tickable 14 to matrices of any size
+whose entries are elements of a Ring or Field from algebra.py, e.g.
+rationalnormalized.Rational or Complex, or plain int and float numbers:
+
+ * the entries are stored row by row in a flat list; matrices of int and
+   float entries are stored in a flat NumPy array instead and use NumPy for
+   all arithmetic
+ * large square matrices are multiplied with Strassen's algorithm, which
+   needs 7 instead of 8 products of half-size blocks
+ * det() and solve() use Bareiss fraction-free elimination: every
+   intermediate entry is a minor of the original matrix, so that e.g.
+   Rational entries do not grow exponentially during the elimination
+
+Entries of a Ring class must support == so that zero pivots can be detected.
+'''
+import numbers
+import operator
+import numpy as np
+from algebra import Ring, Field
+from rationalnormalized import Rational
+
+# Square matrices of generic entries larger than this are multiplied with
+# Strassen's algorithm
+STRASSEN_THRESHOLD = 32
+
+_INT64_MAX = 2**63 - 1
+
+class Matrix(Ring):
+    '''Ring of n x n matrices (A^(n x n), +, ., zero, id); rectangular matrices
+    can be added and multiplied if their shapes agree'''
+
+    __slots__ = ('rows', 'cols', 'entries')
+
+    def __init__(self, rows):
+        '''Create a matrix from a list of rows, e.g. Matrix([[1, 5], [-1, 2]])'''
+        if isinstance(rows, np.ndarray):
+            rows = rows.tolist()
+        self.rows = len(rows)
+        self.cols = len(rows[0]) if self.rows > 0 else 0
+        if any(len(row) != self.cols for row in rows):
+            raise ValueError('All rows of a Matrix must have the same length.')
+        self.entries = _store([x for row in rows for x in row])
+
+    @classmethod
+    def _make(cls, rows, cols, entries):
+        '''Create Matrix from its shape and flat list or array of entries'''
+        A = object.__new__(cls)
+        A.rows = rows
+        A.cols = cols
+        A.entries = entries
+        return A
+
+    def __str__(self):
+        return '['+', '.join('['+', '.join(str(x) for x in row)+']' for row in self.tolist())+']'
+
+    def tolist(self):
+        '''Return the entries as a list of rows'''
+        e = self.entries.tolist() if isinstance(self.entries, np.ndarray) else self.entries
+        return [e[i*self.cols:(i+1)*self.cols] for i in range(self.rows)]
+
+    def __getitem__(self, index):
+        i, j = index
+        return self.entries[i*self.cols + j]
+
+    def id(n):
+        '''Return the n x n identity matrix of int entries'''
+        return Matrix._make(n, n, np.eye(n, dtype=np.int64).ravel())
+
+    def zero(n):
+        '''Return the n x n zero matrix of int entries'''
+        return Matrix._make(n, n, np.zeros(n*n, dtype=np.int64))
+
+    def __eq__(A, B):
+        if not isinstance(B, Matrix):
+            return NotImplemented
+        return (A.rows, A.cols) == (B.rows, B.cols) and \
+            all(a == b for a, b in zip(_as_list(A.entries), _as_list(B.entries)))
+
+    __hash__ = None
+
+    def __add__(A, B):
+        if not isinstance(B, Matrix):
+            return NotImplemented
+        if (A.rows, A.cols) != (B.rows, B.cols):
+            raise ValueError('Matrices of different shapes cannot be added.')
+        a, b = A.entries, B.entries
+        if _numeric(a) and _numeric(b) and not _may_overflow(a, b, 1, operator.add):
+            return Matrix._make(A.rows, A.cols, a + b)
+        return Matrix._make(A.rows, A.cols, _add(_as_list(a), _as_list(b)))
+
+    def __neg__(A):
+        a = A.entries
+        if _numeric(a) and not (a.dtype == np.int64 and (a == -_INT64_MAX-1).any()):
+            return Matrix._make(A.rows, A.cols, -a)
+        return Matrix._make(A.rows, A.cols, [-x for x in _as_list(a)])
+
+    def __mul__(A, B):
+        if not isinstance(B, Matrix):
+            return NotImplemented
+        if A.cols != B.rows:
+            raise ValueError('Matrices of shapes (%d, %d) and (%d, %d) cannot be multiplied.'
+                             % (A.rows, A.cols, B.rows, B.cols))
+        a, b = A.entries, B.entries
+        if _numeric(a) and _numeric(b) and not _may_overflow(a, b, A.cols, operator.mul):
+            c = a.reshape(A.rows, A.cols) @ b.reshape(B.rows, B.cols)
+            return Matrix._make(A.rows, B.cols, c.ravel())
+        a, b = _as_list(a), _as_list(b)
+        n = A.rows
+        if n == A.cols == B.cols and n > STRASSEN_THRESHOLD:
+            c = _strassen(a, b, n, _zero_like(a[0]))
+        else:
+            c = _mul(a, b, A.rows, A.cols, B.cols)
+        return Matrix._make(A.rows, B.cols, _store(c))
+
+    def __pow__(A, n):
+        if A.rows != A.cols:
+            raise ValueError('Only square matrices have powers.')
+        if n == 0:
+            return Matrix.id(A.rows)
+        return Ring.__pow__(A, n)
+
+    def det(self):
+        '''Return the determinant of a square matrix
+
+        Float matrices use numpy.linalg.det. For all other entries the
+        determinant is computed exactly with Bareiss elimination: int entries
+        stay int and entries of a Field stay in the Field.
+        '''
+        n = self.rows
+        if n != self.cols:
+            raise ValueError('Only square matrices have a determinant.')
+        if n == 0:
+            return 1
+        if _numeric(self.entries) and self.entries.dtype == np.float64:
+            return float(np.linalg.det(self.entries.reshape(n, n)))
+        M = self.tolist()
+        sign = _bareiss(M, n, n)
+        if sign == 0:
+            return _zero_like(M[0][0])
+        return M[n-1][n-1] if sign > 0 else -M[n-1][n-1]
+
+    def solve(self, b):
+        '''Solve the linear system A x = b for a square matrix A
+
+        Input:
+          * b = Matrix with as many rows as A, or a list of entries (one column)
+        Output:
+          * x of the same kind as b
+
+        Matrices stored as NumPy arrays (float entries, or int entries which
+        fit into int64) are solved with numpy.linalg.solve, so that x has float
+        entries. Otherwise A must have entries in a Field or int entries; the
+        system is reduced with Bareiss elimination and x is found exactly by
+        back substitution, where quotients of ints become
+        rationalnormalized.Rational. A ZeroDivisionError is raised if A is
+        singular.
+        '''
+        n = self.rows
+        if n != self.cols:
+            raise ValueError('Only square systems can be solved.')
+        is_list = not isinstance(b, Matrix)
+        B = Matrix([[x] for x in b]) if is_list else b
+        if B.rows != n:
+            raise ValueError('Right-hand side must have as many rows as the matrix.')
+        k = B.cols
+        if _numeric(self.entries) and _numeric(B.entries):
+            try:
+                x = np.linalg.solve(self.entries.reshape(n, n).astype(np.float64),
+                                    B.entries.reshape(n, k).astype(np.float64))
+            except np.linalg.LinAlgError:
+                raise ZeroDivisionError('Matrix is singular')
+            X = Matrix._make(n, k, x.ravel())
+        else:
+            M = [row + rhs for row, rhs in zip(self.tolist(), B.tolist())]
+            if _bareiss(M, n, n + k) == 0:
+                raise ZeroDivisionError('Matrix is singular')
+            x = [[None]*k for i in range(n)]
+            for i in range(n-1, -1, -1):
+                for j in range(k):
+                    s = M[i][n+j]
+                    for l in range(i+1, n):
+                        s = s - M[i][l]*x[l][j]
+                    if isinstance(s, numbers.Integral) and isinstance(M[i][i], numbers.Integral):
+                        x[i][j] = Rational(int(s), int(M[i][i]))
+                    else:
+                        x[i][j] = s / M[i][i]
+            X = Matrix(x)
+        return [row[0] for row in X.tolist()] if is_list else X
+
+
+def _numeric(entries):
+    return isinstance(entries, np.ndarray)
+
+def _as_list(entries):
+    return entries.tolist() if isinstance(entries, np.ndarray) else entries
+
+def _store(entries):
+    '''Flat NumPy array for int and float entries (int only if all fit in
+    int64), otherwise the list itself'''
+    if all(isinstance(x, numbers.Integral) and not isinstance(x, bool) for x in entries):
+        if all(-_INT64_MAX <= x <= _INT64_MAX for x in entries):
+            return np.array(entries, dtype=np.int64)
+        return [int(x) for x in entries]
+    if all(isinstance(x, (numbers.Integral, float, np.floating)) for x in entries):
+        return np.array(entries, dtype=np.float64)
+    return list(entries)
+
+def _may_overflow(a, b, m, op):
+    '''True if an int64 result of a + b or a @ b (with m terms per entry) may
+    not fit into int64'''
+    if a.dtype != np.int64 or b.dtype != np.int64 or len(a) == 0 or len(b) == 0:
+        return False
+    x = int(np.abs(a).max()) if not (a == -_INT64_MAX-1).any() else _INT64_MAX+1
+    y = int(np.abs(b).max()) if not (b == -_INT64_MAX-1).any() else _INT64_MAX+1
+    return m * op(x, y) > _INT64_MAX
+
+def _zero_like(x):
+    '''The zero of the ring of x'''
+    return x.__class__.zero() if isinstance(x, Ring) else 0
+
+def _add(a, b):
+    return [x + y for x, y in zip(a, b)]
+
+def _sub(a, b):
+    return [x - y for x, y in zip(a, b)]
+
+def _mul(a, b, n, m, p):
+    '''Product of the n x m matrix a and the m x p matrix b, both flat lists'''
+    cols = [b[j::p] for j in range(p)]
+    c = []
+    for i in range(n):
+        row = a[i*m:(i+1)*m]
+        for col in cols:
+            s = row[0]*col[0]
+            for k in range(1, m):
+                s = s + row[k]*col[k]
+            c.append(s)
+    return c
+
+def _strassen(a, b, n, zero):
+    '''Product of the n x n matrices a and b (flat lists) with Strassen's algorithm'''
+    if n <= STRASSEN_THRESHOLD:
+        return _mul(a, b, n, n, n)
+    if n % 2 == 1:
+        # pad with a zero row and column
+        a = _pad(a, n, zero)
+        b = _pad(b, n, zero)
+        c = _strassen(a, b, n+1, zero)
+        return [c[i*(n+1) + j] for i in range(n) for j in range(n)]
+    h = n // 2
+    a11, a12, a21, a22 = _split(a, n)
+    b11, b12, b21, b22 = _split(b, n)
+    m1 = _strassen(_add(a11, a22), _add(b11, b22), h, zero)
+    m2 = _strassen(_add(a21, a22), b11, h, zero)
+    m3 = _strassen(a11, _sub(b12, b22), h, zero)
+    m4 = _strassen(a22, _sub(b21, b11), h, zero)
+    m5 = _strassen(_add(a11, a12), b22, h, zero)
+    m6 = _strassen(_sub(a21, a11), _add(b11, b12), h, zero)
+    m7 = _strassen(_sub(a12, a22), _add(b21, b22), h, zero)
+    c11 = _add(_sub(_add(m1, m4), m5), m7)
+    c12 = _add(m3, m5)
+    c21 = _add(m2, m4)
+    c22 = _add(_add(_sub(m1, m2), m3), m6)
+    c = []
+    for i in range(h):
+        c.extend(c11[i*h:(i+1)*h])
+        c.extend(c12[i*h:(i+1)*h])
+    for i in range(h):
+        c.extend(c21[i*h:(i+1)*h])
+        c.extend(c22[i*h:(i+1)*h])
+    return c
+
+def _split(a, n):
+    '''The four h x h blocks of the n x n matrix a, with n = 2h'''
+    h = n // 2
+    top = [a[i*n:(i+1)*n] for i in range(h)]
+    bottom = [a[i*n:(i+1)*n] for i in range(h, n)]
+    return ([x for row in top for x in row[:h]], [x for row in top for x in row[h:]],
+            [x for row in bottom for x in row[:h]], [x for row in bottom for x in row[h:]])
+
+def _pad(a, n, zero):
+    c = []
+    for i in range(n):
+        c.extend(a[i*n:(i+1)*n])
+        c.append(zero)
+    return c + [zero]*(n+1)
+
+def _exact_div(a, b):
+    '''a / b for a quotient which is known to be exact; int / int stays int'''
+    if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
+        return a // b
+    return a / b
+
+def _bareiss(M, n, m):
+    '''Bareiss fraction-free elimination of the first n columns of the n x m
+    matrix M (list of rows), in place
+
+    Afterwards M is upper triangular in its first n columns and M[k][k] is
+    (up to sign) the leading (k+1) x (k+1) minor of the original matrix.
+    Returns the sign of the row permutation, or 0 if the matrix is singular.
+    '''
+    for row in M:
+        for x in row:
+            if not isinstance(x, (numbers.Number, Field)):
+                raise ValueError('Bareiss elimination needs entries in a Field or int entries.')
+    zero = _zero_like(M[0][0])
+    sign = 1
+    prev = None
+    for k in range(n):
+        if M[k][k] == zero:
+            for i in range(k+1, n):
+                if not (M[i][k] == zero):
+                    M[k], M[i] = M[i], M[k]
+                    sign = -sign
+                    break
+            else:
+                return 0
+        p = M[k][k]
+        row_k = M[k]
+        for i in range(k+1, n):
+            row_i = M[i]
+            q = row_i[k]
+            for j in range(k+1, m):
+                # exact division: the result is a minor of the original matrix
+                t = p*row_i[j] - q*row_k[j]
+                row_i[j] = t if prev is None else _exact_div(t, prev)
+            row_i[k] = zero
+        prev = p
+    return sign
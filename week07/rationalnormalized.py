@@ -0,0 +1,154 @@
+'''Normalized rational numbers
+
+The class Rational in this module is a drop-in replacement for
+rationalclass.Rational which can be used for long computations:
+
+ * numerator and denominator are always reduced by their gcd and the sign is
+   carried by the numerator, so that numbers do not grow without bound
+ * instances use __slots__ and carry no per-instance __dict__
+ * __eq__ and __hash__ make instances usable in sets and as dictionary keys;
+   hashes agree with int and fractions.Fraction for equal values
+ * all arithmetic operators accept int and Rational operands directly
+ * the common values 0, 1, -1 and 1/2 are interned
+
+Instances are meant to be immutable and should not be modified after creation.
+'''
+import math
+import sys
+from algebra import Ring, Field
+
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INF = sys.hash_info.inf
+
+class Rational(Field):
+    '''Field of rational numbers (Q, +, ., zero, id) in normalized form'''
+
+    __slots__ = ('num', 'denom')
+
+    # Interned instances, indexed by (num, denom)
+    _interned = {}
+
+    def __new__(cls, num, denom=1):
+        if denom == 0:
+            raise ZeroDivisionError('Rational with zero denominator')
+        if denom < 0:
+            num, denom = -num, -denom
+        g = math.gcd(num, denom)
+        if g > 1:
+            num //= g
+            denom //= g
+        return cls._make(num, denom)
+
+    @classmethod
+    def _make(cls, num, denom):
+        '''Create Rational from numerator and denominator which are already normalized'''
+        r = cls._interned.get((num, denom)) if denom <= 2 else None
+        if r is None:
+            r = object.__new__(cls)
+            r.num = num
+            r.denom = denom
+        return r
+
+    def __str__(self):
+        return '('+str(self.num)+'/'+str(self.denom)+')'
+
+    def id():
+        return Rational._make(1, 1)
+
+    def zero():
+        return Rational._make(0, 1)
+
+    def __mul__(a, b):
+        if isinstance(b, int):
+            if b == 0:
+                return Rational._make(0, 1)
+            g = math.gcd(b, a.denom)
+            return Rational._make(a.num*(b//g), a.denom//g)
+        elif isinstance(b, Rational):
+            # cross-cancel before multiplying to keep the products small
+            g1 = math.gcd(a.num, b.denom)
+            g2 = math.gcd(b.num, a.denom)
+            return Rational._make((a.num//g1)*(b.num//g2), (a.denom//g2)*(b.denom//g1))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __add__(a, b):
+        if isinstance(b, int):
+            return Rational._make(a.num + b*a.denom, a.denom)
+        elif isinstance(b, Rational):
+            if a.denom == b.denom:
+                return Rational(a.num + b.num, a.denom)
+            # Knuth, TAOCP Vol. 2, 4.5.1: only use gcd of the denominators
+            g = math.gcd(a.denom, b.denom)
+            if g == 1:
+                return Rational._make(a.num*b.denom + b.num*a.denom, a.denom*b.denom)
+            s = a.denom // g
+            t = a.num*(b.denom//g) + b.num*s
+            g2 = math.gcd(t, g)
+            if g2 == 1:
+                return Rational._make(t, s*b.denom)
+            return Rational._make(t//g2, s*(b.denom//g2))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(a, b):
+        if isinstance(b, (int, Rational)):
+            return a + (-b)
+        return NotImplemented
+
+    def __rsub__(a, b):
+        if isinstance(b, int):
+            return (-a) + b
+        return NotImplemented
+
+    def __neg__(a):
+        return Rational._make(-a.num, a.denom)
+
+    def inv(a):
+        if a.num == 0:
+            raise ZeroDivisionError('Rational(0/1) has no inverse')
+        if a.num < 0:
+            return Rational._make(-a.denom, -a.num)
+        return Rational._make(a.denom, a.num)
+
+    def __truediv__(a, b):
+        if isinstance(b, int):
+            return a * Rational(1, b)
+        elif isinstance(b, Rational):
+            return a * b.inv()
+        return NotImplemented
+
+    def __rtruediv__(a, b):
+        if isinstance(b, int):
+            return a.inv() * b
+        return NotImplemented
+
+    def __eq__(a, b):
+        if isinstance(b, int):
+            return a.denom == 1 and a.num == b
+        elif isinstance(b, Rational):
+            return a.num == b.num and a.denom == b.denom
+        return NotImplemented
+
+    def __hash__(a):
+        # Same hash as fractions.Fraction, so that equal values hash equally
+        try:
+            dinv = pow(a.denom, -1, _HASH_MODULUS)
+        except ValueError:
+            h = _HASH_INF
+        else:
+            h = hash(hash(abs(a.num)) * dinv)
+        h = h if a.num >= 0 else -h
+        return -2 if h == -1 else h
+
+    def __float__(a):
+        return a.num / a.denom
+
+    def __reduce__(a):
+        return (Rational, (a.num, a.denom))
+
+for _num, _denom in [(0, 1), (1, 1), (-1, 1), (1, 2)]:
+    Rational._interned[(_num, _denom)] = Rational._make(_num, _denom)
+del _num, _denom
@@ -0,0 +1,116 @@
+'''Tests for powers in the abstract classes Ring and Field'''
+import algebra
+from algebra import Ring, Field
+from rationalnormalized import Rational
+
+
+class Mod7(Field):
+    '''Field of integers modulo 7, counting the number of multiplications'''
+
+    multiplications = 0
+
+    def __init__(self, k):
+        self.k = k % 7
+
+    def __str__(self):
+        return str(self.k) + ' mod 7'
+
+    def id():
+        return Mod7(1)
+
+    def zero():
+        return Mod7(0)
+
+    def __mul__(a, b):
+        Mod7.multiplications += 1
+        return Mod7(a.k*b.k)
+
+    def __add__(a, b):
+        return Mod7(a.k + b.k)
+
+    def __neg__(a):
+        return Mod7(-a.k)
+
+    def inv(a):
+        return Mod7(pow(a.k, -1, 7))
+
+    def __eq__(a, b):
+        return a.k == b.k
+
+    def __hash__(a):
+        return hash(a.k)
+
+
+class CachedMod7(Mod7):
+    power_cache_size = 2
+
+
+class Integer(Ring):
+    '''Ring of integers, which is not a Field'''
+
+    def __init__(self, k):
+        self.k = k
+
+    def __str__(self):
+        return str(self.k)
+
+    def id():
+        return Integer(1)
+
+    def zero():
+        return Integer(0)
+
+    def __mul__(a, b):
+        return Integer(a.k*b.k)
+
+    def __add__(a, b):
+        return Integer(a.k + b.k)
+
+    def __neg__(a):
+        return Integer(-a.k)
+
+
+def test_large_power():
+    '''Check that (1/2)^2000 is computed without deep recursion'''
+    assert Rational(1, 2)**2000 == Rational(1, 2**2000)
+
+
+def test_negative_power_field():
+    '''Check that a^-3 == (1/a)^3 in a Field'''
+    assert Rational(2, 3)**-3 == Rational(27, 8)
+    assert (Mod7(3)**-3).k == pow(3, -3, 7)
+
+
+def test_negative_power_ring():
+    '''Check that negative powers raise a ValueError outside a Field'''
+    try:
+        Integer(2)**-1
+    except ValueError:
+        return
+    assert False
+
+
+def test_integral_float_power():
+    '''Check that a**2.0 == a**2 and a**0 == id, but a**2.5 raises a ValueError'''
+    assert (Integer(3)**2.0).k == 9
+    assert (Integer(3)**0).k == 1
+    try:
+        Integer(3)**2.5
+    except ValueError:
+        return
+    assert False
+
+
+def test_power_cache():
+    '''Check that repeated powers of a cached base reuse the squares'''
+    a = CachedMod7(3)
+    Mod7.multiplications = 0
+    assert (a**64).k == pow(3, 64, 7)
+    first = Mod7.multiplications
+    Mod7.multiplications = 0
+    assert (a**64).k == pow(3, 64, 7)
+    assert Mod7.multiplications == 0 < first
+    # only the power_cache_size most recently used bases are kept
+    CachedMod7(2)**4
+    CachedMod7(5)**4
+    assert a not in algebra._power_caches[CachedMod7]
@@ -0,0 +1,106 @@
+'''Tests for dense matrices over a Ring'''
+import random
+from fractions import Fraction
+import matrix
+from matrix import Matrix
+from rationalnormalized import Rational as R
+
+
+def _fraction_det(rows):
+    '''Determinant by Gaussian elimination over fractions.Fraction'''
+    M = [[Fraction(x.num, x.denom) if isinstance(x, R) else Fraction(x) for x in row] for row in rows]
+    n = len(M)
+    d = Fraction(1)
+    for k in range(n):
+        p = next((i for i in range(k, n) if M[i][k] != 0), None)
+        if p is None:
+            return Fraction(0)
+        if p != k:
+            M[k], M[p] = M[p], M[k]
+            d = -d
+        d *= M[k][k]
+        for i in range(k+1, n):
+            f = M[i][k] / M[k][k]
+            M[i] = [a - f*b for a, b in zip(M[i], M[k])]
+    return d
+
+
+def _random_rows(n, m, seed):
+    rng = random.Random(seed)
+    return [[R(rng.randint(-9, 9), rng.randint(1, 5)) for j in range(m)] for i in range(n)]
+
+
+def test_mat2x2():
+    '''Check the Mat2x2 examples from Tickable 14'''
+    A = Matrix([[1, 5], [-1, 2]])
+    B = Matrix([[0, 2], [1, 1]])
+    assert str(A*B) == '[[5, 7], [2, 0]]'
+    assert str(A+B) == '[[1, 7], [0, 3]]'
+    assert str(-A) == '[[-1, -5], [1, -2]]'
+    assert A.det() == 7
+    assert A**0 == Matrix.id(2)
+
+
+def test_det_rational():
+    '''Check Bareiss determinants of Rational matrices against fractions.Fraction'''
+    for n in [1, 2, 3, 6]:
+        rows = _random_rows(n, n, n)
+        d = Matrix(rows).det()
+        assert Fraction(d.num, d.denom) == _fraction_det(rows)
+
+
+def test_det_mixed_int_rational():
+    '''Check the determinant of a matrix with both int and Rational entries'''
+    rows = [[1, R(1, 2), 0], [R(1, 3), 1, R(1, 4)], [0, R(2, 5), 1]]
+    d = Matrix(rows).det()
+    assert Fraction(d.num, d.denom) == _fraction_det(rows)
+
+
+def test_det_int_exact():
+    '''Check that int determinants are exact, including a singular matrix'''
+    rng = random.Random(1)
+    rows = [[rng.randint(-10**6, 10**6) for j in range(10)] for i in range(10)]
+    assert Matrix(rows).det() == _fraction_det(rows)
+    assert Matrix([[1, 2], [2, 4]]).det() == 0
+
+
+def test_solve_rational():
+    '''Check that A x = b holds exactly for the solution of a Rational system'''
+    rows = _random_rows(5, 5, 2)
+    b = [R(k) for k in range(5)]
+    x = Matrix(rows).solve(b)
+    assert Matrix(rows) * Matrix([[y] for y in x]) == Matrix([[y] for y in b])
+
+
+def test_solve_big_int_exact():
+    '''Check that systems of ints beyond int64 are solved exactly'''
+    big = 2**70
+    x = Matrix([[big, 1], [1, 1]]).solve([big + 2, 3])
+    assert x == [R(1), R(2)]
+    assert all(isinstance(y, R) for y in x)
+
+
+def test_solve_singular():
+    '''Check that solving a singular system raises ZeroDivisionError'''
+    try:
+        Matrix([[R(1), R(2)], [R(2), R(4)]]).solve([R(1), R(1)])
+    except ZeroDivisionError:
+        return
+    assert False
+
+
+def test_strassen(monkeypatch):
+    '''Check that Strassen multiplication agrees with the plain product'''
+    monkeypatch.setattr(matrix, 'STRASSEN_THRESHOLD', 4)
+    for n in [5, 8, 9]:
+        a = _random_rows(n, n, 10 + n)
+        b = _random_rows(n, n, 20 + n)
+        flat_a = [x for row in a for x in row]
+        flat_b = [x for row in b for x in row]
+        assert (Matrix(a) * Matrix(b)).entries == matrix._mul(flat_a, flat_b, n, n, n)
+
+
+def test_int64_overflow():
+    '''Check that int products beyond int64 are exact'''
+    A = Matrix([[2**40, 2**40], [2**40, 2**40]])
+    assert (A*A)[0, 0] == 2**81
@@ -0,0 +1,150 @@
+'''Loader for the climate data CSV files
+
+The files climate_data.csv (and week01/global_temperature.csv) contain one
+header row followed by rows of the form
+
+Time, Anomaly, Lower confidence limit, Upper confidence limit
+
+load() parses such a file into four typed NumPy columns and stores them in a
+sidecar directory <file>.cache next to the CSV file. Later calls map the
+cached .npy files into memory instead of parsing the CSV file again. The cache
+is keyed on the size, the modification time and the SHA-256 hash of the CSV
+file, so it is rebuilt whenever the file changes.
+
+iter_chunks() reads files which are too large to load at once in chunks of a
+fixed number of rows.
+
+Example:
+
+import climate_data
+time, anomaly, conf_lo, conf_hi = climate_data.load('climate_data.csv')
+'''
+
+import collections
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+ClimateData = collections.namedtuple('ClimateData', ['time', 'anomaly', 'conf_lo', 'conf_hi'])
+
+# Version of the cache layout, caches with a different version are rebuilt
+_CACHE_VERSION = 1
+
+
+def load(path='climate_data.csv', cache=True, cache_dir=None):
+    '''Load a climate data CSV file into NumPy columns
+
+    input:
+      * path of the CSV file
+      * cache: use (and create) the memory-mapped cache if True
+      * cache_dir: directory for the cache (default: <path>.cache)
+    output:
+      * ClimateData(time, anomaly, conf_lo, conf_hi) of NumPy arrays. The
+        columns are read-only memory maps if they come from the cache.
+    '''
+    if not cache:
+        return _parse(path)
+    if cache_dir is None:
+        cache_dir = path + '.cache'
+    stat = os.stat(path)
+    meta = _read_meta(cache_dir)
+    if meta is not None:
+        if (meta['size'] == stat.st_size) and (meta['mtime_ns'] == stat.st_mtime_ns):
+            return _load_cache(cache_dir)
+        if (meta['size'] == stat.st_size) and (meta['sha256'] == _hash_file(path)):
+            # the file was touched but its content is unchanged
+            meta['mtime_ns'] = stat.st_mtime_ns
+            _write_meta(cache_dir, meta)
+            return _load_cache(cache_dir)
+    data = _parse(path)
+    _write_cache(cache_dir, data, {'version': _CACHE_VERSION,
+                                   'size': stat.st_size,
+                                   'mtime_ns': stat.st_mtime_ns,
+                                   'sha256': _hash_file(path)})
+    return _load_cache(cache_dir)
+
+
+def iter_chunks(path='climate_data.csv', chunk_rows=100000):
+    '''Read a climate data CSV file in chunks of at most chunk_rows rows
+
+    input:
+      * path of the CSV file
+      * chunk_rows: number of rows per chunk
+    output:
+      * generator of ClimateData(time, anomaly, conf_lo, conf_hi) chunks
+    '''
+    with open(path, 'r') as climate_file:
+        next(climate_file)  # skip header
+        while True:
+            lines = list(itertools.islice(climate_file, chunk_rows))
+            if len(lines) == 0:
+                return
+            yield _columns(np.loadtxt(lines, delimiter=',', ndmin=2))
+
+
+def _parse(path):
+    '''Parse the whole CSV file (without cache)'''
+    return _columns(np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2))
+
+
+def _columns(table):
+    '''Split a parsed table into typed columns, years are stored as integers'''
+    if not (table.shape[1] == 4):
+        raise ValueError('Expected 4 columns: Time, Anomaly, Lower, Upper')
+    time = table[:, 0]
+    if np.all(time == np.round(time)):
+        time = time.astype(np.int64)
+    else:
+        time = np.ascontiguousarray(time)
+    return ClimateData(time, *[np.ascontiguousarray(table[:, j]) for j in range(1, 4)])
+
+
+def _hash_file(path, block_size=2**20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not (meta.get('version') == _CACHE_VERSION):
+        return None
+    return meta
+
+
+def _write_meta(cache_dir, meta):
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.json')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(cache_dir, 'meta.json'))
+
+
+def _write_cache(cache_dir, data, meta):
+    '''Write the columns and meta data to a new directory, then swap it in'''
+    parent = os.path.dirname(os.path.abspath(cache_dir))
+    tmp = tempfile.mkdtemp(dir=parent, prefix='.climate_cache_')
+    for name, column in zip(ClimateData._fields, data):
+        np.save(os.path.join(tmp, name + '.npy'), column)
+    _write_meta(tmp, meta)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    try:
+        os.replace(tmp, cache_dir)
+    except OSError:
+        # another process has written the cache in the meantime
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _load_cache(cache_dir):
+    return ClimateData(*[np.load(os.path.join(cache_dir, name + '.npy'), mmap_mode='r')
+                         for name in ClimateData._fields])
@@ -0,0 +1,172 @@
+'''Downsampling of long time series before plotting
+
+Plotting millions of points with plt.plot() or plt.fill_between() is slow,
+although a plot is only a few thousand pixels wide. The functions in this
+module select a small subset of the points which looks the same when plotted:
+
+ * lttb(): Largest-Triangle-Three-Buckets, keeps the visual shape of a line
+ * minmax(): keeps the minimum and maximum of every pixel bucket, so that no
+   peaks are lost
+ * band_envelope(): decimates a confidence band (lower and upper limits) such
+   that the decimated band contains the original band
+
+The class LevelOfDetail caches decimated versions of a series, so that
+zooming into a range only decimates the visible window.
+
+Example:
+
+import downsample
+idx = downsample.lttb(time, anomaly, 1000)
+plt.plot(time[idx], anomaly[idx])
+t, lo, hi = downsample.band_envelope(time, conf_lo, conf_hi, 500)
+plt.fill_between(t, lo, hi, color='c')
+'''
+
+import collections
+
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    '''Largest-Triangle-Three-Buckets downsampling
+
+    input:
+      * arrays x (increasing) and y of the same length n
+      * number of points n_out >= 3 to keep
+    output:
+      * increasing array of the indices of the selected points
+    '''
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError('lttb needs n_out >= 3')
+    # n-2 inner points in n_out-2 buckets, the first and last points are kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # the next-bucket average of the last bucket is the last point
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        xb = x[lo:hi]
+        yb = y[lo:hi]
+        area = np.abs((x[a] - avg_x[i]) * (yb - y[a]) - (x[a] - xb) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def _buckets(n, n_buckets):
+    '''Start indices of n_buckets buckets of (almost) equal size, and bucket ids'''
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    edges = np.unique(edges)
+    bucket = np.repeat(np.arange(len(edges) - 1), np.diff(edges))
+    return edges[:-1], bucket
+
+
+def _first_match(values, bucket, targets):
+    '''Index of the first entry in each bucket which equals the bucket's target'''
+    hits = np.flatnonzero(values == targets[bucket])
+    _, first = np.unique(bucket[hits], return_index=True)
+    return hits[first]
+
+
+def minmax(y, n_buckets):
+    '''Keep the minimum and maximum of each bucket (e.g. one bucket per pixel)
+
+    input:
+      * array y of length n
+      * number of buckets
+    output:
+      * increasing array of the indices of the selected points (at most
+        2*n_buckets)
+    '''
+    y = np.asarray(y)
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+    starts, bucket = _buckets(n, n_buckets)
+    i_min = _first_match(y, bucket, np.minimum.reduceat(y, starts))
+    i_max = _first_match(y, bucket, np.maximum.reduceat(y, starts))
+    return np.unique(np.concatenate((i_min, i_max)))
+
+
+def band_envelope(x, lo, hi, n_buckets):
+    '''Decimate a confidence band [lo, hi] without cutting into it
+
+    Every bucket is replaced by its first and last x value together with the
+    smallest lower limit and the largest upper limit in the bucket, so that the
+    decimated band drawn with plt.fill_between() contains the original band.
+
+    input:
+      * arrays x (increasing), lo and hi of the same length n
+      * number of buckets
+    output:
+      * arrays x, lo, hi of length at most 2*n_buckets
+    '''
+    x = np.asarray(x)
+    lo = np.asarray(lo)
+    hi = np.asarray(hi)
+    n = len(x)
+    if 2 * n_buckets >= n:
+        return x, lo, hi
+    starts, _ = _buckets(n, n_buckets)
+    ends = np.append(starts[1:], n) - 1
+    lo_b = np.minimum.reduceat(lo, starts)
+    hi_b = np.maximum.reduceat(hi, starts)
+    xs = np.column_stack((x[starts], x[ends])).ravel()
+    return xs, np.repeat(lo_b, 2), np.repeat(hi_b, 2)
+
+
+class LevelOfDetail(object):
+    '''Cached downsampling of a time series for interactive zooming
+
+    The series is decimated once per resolution for the whole range. For a
+    zoomed view, only the visible window is decimated and the result is kept
+    in a small LRU cache.
+    '''
+
+    def __init__(self, x, y, method='lttb', cache_size=32):
+        '''x (increasing) and y are the data, method is 'lttb' or 'minmax' '''
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        if method not in ('lttb', 'minmax'):
+            raise ValueError("method must be 'lttb' or 'minmax'")
+        self.method = method
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()
+
+    def _decimate(self, i0, i1, n_pixels):
+        key = (i0, i1, n_pixels)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if self.method == 'lttb':
+            idx = lttb(self.x[i0:i1], self.y[i0:i1], max(n_pixels, 3))
+        else:
+            idx = minmax(self.y[i0:i1], n_pixels)
+        idx = idx + i0
+        self._cache[key] = idx
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return idx
+
+    def view(self, x_min=None, x_max=None, n_pixels=1000):
+        '''Return the decimated points (x, y) with x_min <= x <= x_max
+
+        One extra point on either side of the window is included, so that the
+        line continues to the edge of the plot.
+        '''
+        i0 = 0 if x_min is None else max(int(np.searchsorted(self.x, x_min, side='left')) - 1, 0)
+        i1 = len(self.x) if x_max is None else min(int(np.searchsorted(self.x, x_max, side='right')) + 1, len(self.x))
+        idx = self._decimate(i0, i1, n_pixels)
+        return self.x[idx], self.y[idx]
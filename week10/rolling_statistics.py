@@ -0,0 +1,169 @@
+'''Incremental rolling statistics for temperature anomaly series
+
+The statistics are updated in O(1) amortised time per new value, so that
+appended rows can be processed without reading the history again:
+
+ * rolling mean and variance over a window (Welford's algorithm with removal)
+ * rolling minimum and maximum over a window (monotonic deques)
+ * exponentially weighted mean
+ * running least-squares trend (slope and intercept) of all values so far
+
+Example:
+
+import csv
+import rolling_statistics
+
+stats = rolling_statistics.RollingStatistics(window=10, alpha=0.2)
+with open('climate_data.csv', 'r') as climate_file:
+    for s in stats.process(csv.reader(climate_file)):
+        print(s.time, s.mean, s.trend_slope)
+
+Calling stats.process() again with new rows continues where it stopped.
+'''
+
+import collections
+import math
+
+Statistics = collections.namedtuple('Statistics', [
+    'time', 'value', 'mean', 'variance', 'min', 'max',
+    'ew_mean', 'trend_slope', 'trend_intercept'])
+
+
+class RollingMeanVariance(object):
+    '''Mean and sample variance over the last window values (Welford)'''
+
+    def __init__(self, window):
+        self.window = window
+        self.values = collections.deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x):
+        self.values.append(x)
+        d = x - self.mean
+        self.mean += d / len(self.values)
+        self.m2 += d * (x - self.mean)
+        if len(self.values) > self.window:
+            y = self.values.popleft()
+            d = y - self.mean
+            self.mean -= d / len(self.values)
+            self.m2 -= d * (y - self.mean)
+
+    def variance(self):
+        n = len(self.values)
+        if n < 2:
+            return math.nan
+        return max(self.m2, 0.0) / (n - 1)
+
+
+class RollingMinMax(object):
+    '''Minimum and maximum over the last window values (monotonic deques)'''
+
+    def __init__(self, window):
+        self.window = window
+        self.count = 0
+        self._min = collections.deque()  # (index, value), values increasing
+        self._max = collections.deque()  # (index, value), values decreasing
+
+    def update(self, x):
+        k = self.count
+        self.count += 1
+        while self._min and self._min[-1][1] >= x:
+            self._min.pop()
+        self._min.append((k, x))
+        while self._max and self._max[-1][1] <= x:
+            self._max.pop()
+        self._max.append((k, x))
+        if self._min[0][0] <= k - self.window:
+            self._min.popleft()
+        if self._max[0][0] <= k - self.window:
+            self._max.popleft()
+
+    def min(self):
+        return self._min[0][1]
+
+    def max(self):
+        return self._max[0][1]
+
+
+class EWMean(object):
+    '''Exponentially weighted mean m <- alpha*x + (1-alpha)*m'''
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.mean = None
+
+    def update(self, x):
+        if self.mean is None:
+            self.mean = x
+        else:
+            self.mean += self.alpha * (x - self.mean)
+
+
+class RunningTrend(object):
+    '''Least-squares line x = slope*t + intercept through all points so far'''
+
+    def __init__(self):
+        self.n = 0
+        self.mean_t = 0.0
+        self.mean_x = 0.0
+        self.m2_t = 0.0
+        self.c_tx = 0.0
+
+    def update(self, t, x):
+        self.n += 1
+        dt = t - self.mean_t
+        self.mean_t += dt / self.n
+        self.mean_x += (x - self.mean_x) / self.n
+        self.m2_t += dt * (t - self.mean_t)
+        self.c_tx += dt * (x - self.mean_x)
+
+    def slope(self):
+        if self.m2_t == 0:
+            return math.nan
+        return self.c_tx / self.m2_t
+
+    def intercept(self):
+        return self.mean_x - self.slope() * self.mean_t
+
+
+class RollingStatistics(object):
+    '''All rolling statistics of a time series, updated one row at a time'''
+
+    def __init__(self, window=10, alpha=0.1, column=1):
+        '''window: length of the rolling window, alpha: weight of the
+        exponentially weighted mean, column: index of the value column'''
+        self.column = column
+        self.mean_variance = RollingMeanVariance(window)
+        self.min_max = RollingMinMax(window)
+        self.ew_mean = EWMean(alpha)
+        self.trend = RunningTrend()
+
+    def update(self, t, x):
+        '''Add the value x at time t and return the current Statistics'''
+        self.mean_variance.update(x)
+        self.min_max.update(x)
+        self.ew_mean.update(x)
+        self.trend.update(t, x)
+        return Statistics(t, x, self.mean_variance.mean, self.mean_variance.variance(),
+                          self.min_max.min(), self.min_max.max(), self.ew_mean.mean,
+                          self.trend.slope(), self.trend.intercept())
+
+    def process(self, rows):
+        '''Generator of Statistics for an iterator of CSV rows
+
+        rows may be lines of text or lists of fields (e.g. from csv.reader).
+        Empty rows, a header row (whose first field is not a number) and rows
+        without a value in the value column are skipped.
+        '''
+        for row in rows:
+            if isinstance(row, str):
+                row = row.strip().split(',')
+            if len(row) == 0:
+                continue
+            try:
+                t = float(row[0])
+                x = float(row[self.column])
+            except (IndexError, ValueError):
+                continue
+            yield self.update(t, x)
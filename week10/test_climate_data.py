@@ -0,0 +1,82 @@
+'''Tests for the climate data loader and its cache'''
+import json
+import os
+import shutil
+import numpy as np
+import pytest
+import climate_data
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / 'climate_data.csv')
+    shutil.copy(os.path.join(HERE, 'climate_data.csv'), path)
+    return path
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    '''Count the calls of climate_data._parse, i.e. cache rebuilds'''
+    calls = []
+    parse = climate_data._parse
+
+    def spy(path):
+        calls.append(path)
+        return parse(path)
+    monkeypatch.setattr(climate_data, '_parse', spy)
+    return calls
+
+
+def test_cache_reused(csv_path, parse_calls):
+    '''Check that the second load comes from the cache and agrees with parsing'''
+    first = climate_data.load(csv_path)
+    second = climate_data.load(csv_path)
+    assert len(parse_calls) == 1
+    assert isinstance(second.anomaly, np.memmap)
+    for a, b in zip(second, climate_data.load(csv_path, cache=False)):
+        assert (a == b).all()
+    assert second.time.dtype == np.int64 and len(first.time) == 172
+
+
+def test_touched_file(csv_path, parse_calls):
+    '''Check that a new mtime with unchanged content is resolved by the hash'''
+    climate_data.load(csv_path)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    climate_data.load(csv_path)
+    assert len(parse_calls) == 1
+    with open(csv_path + '.cache/meta.json') as f:
+        assert json.load(f)['mtime_ns'] == stat.st_mtime_ns + 10**9
+
+
+def test_changed_content(csv_path, parse_calls):
+    '''Check that a changed file of the same size rebuilds the cache'''
+    climate_data.load(csv_path)
+    with open(csv_path) as f:
+        text = f.read()
+    with open(csv_path, 'w') as f:
+        f.write(text.replace('1850,-0.41765878', '1850,-0.41765879'))
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    data = climate_data.load(csv_path)
+    assert len(parse_calls) == 2
+    assert data.anomaly[0] == -0.41765879
+
+
+def test_cache_version(csv_path, parse_calls, monkeypatch):
+    '''Check that a cache with a different version is rebuilt'''
+    climate_data.load(csv_path)
+    monkeypatch.setattr(climate_data, '_CACHE_VERSION', climate_data._CACHE_VERSION + 1)
+    climate_data.load(csv_path)
+    climate_data.load(csv_path)
+    assert len(parse_calls) == 2
+
+
+def test_iter_chunks(csv_path):
+    '''Check the row counts of the chunks and that they join to the whole file'''
+    chunks = list(climate_data.iter_chunks(csv_path, chunk_rows=50))
+    assert [len(c.time) for c in chunks] == [50, 50, 50, 22]
+    whole = climate_data.load(csv_path, cache=False)
+    assert (np.concatenate([c.anomaly for c in chunks]) == whole.anomaly).all()
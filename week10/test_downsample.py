@@ -0,0 +1,61 @@
+'''Tests for the downsampling of long time series'''
+import numpy as np
+import downsample
+
+
+def _series(n=10000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(n, dtype=float)
+    y = np.cumsum(rng.standard_normal(n))
+    return x, y
+
+
+def test_lttb():
+    '''Check that lttb returns n_out increasing indices including both endpoints'''
+    x, y = _series()
+    for n_out in [3, 10, 999]:
+        idx = downsample.lttb(x, y, n_out)
+        assert len(idx) == n_out
+        assert (np.diff(idx) > 0).all()
+        assert idx[0] == 0 and idx[-1] == len(x) - 1
+
+
+def test_minmax():
+    '''Check that minmax keeps the global minimum and maximum'''
+    x, y = _series()
+    idx = downsample.minmax(y, 100)
+    assert len(idx) <= 200
+    assert (np.diff(idx) > 0).all()
+    assert np.argmin(y) in idx and np.argmax(y) in idx
+
+
+def test_band_envelope():
+    '''Check that the decimated band contains the original band'''
+    x, y = _series()
+    rng = np.random.default_rng(1)
+    lo = y - rng.random(len(y))
+    hi = y + rng.random(len(y))
+    xs, lo_d, hi_d = downsample.band_envelope(x, lo, hi, 50)
+    assert len(xs) == 100
+    assert (np.interp(x, xs, lo_d) <= lo).all()
+    assert (np.interp(x, xs, hi_d) >= hi).all()
+
+
+def test_level_of_detail(monkeypatch):
+    '''Check that views include the edge points and are cached'''
+    x, y = _series()
+    lod = downsample.LevelOfDetail(x, y)
+    calls = []
+    lttb = downsample.lttb
+
+    def spy(*args):
+        calls.append(args)
+        return lttb(*args)
+    monkeypatch.setattr(downsample, 'lttb', spy)
+    xv, yv = lod.view(1000.5, 2000.5, n_pixels=100)
+    assert xv[0] == 1000 and xv[-1] == 2001
+    assert len(xv) == 100
+    lod.view(1000.5, 2000.5, n_pixels=100)
+    assert len(calls) == 1
+    lod.view(n_pixels=100)
+    assert len(calls) == 2
@@ -0,0 +1,34 @@
+'''Tests for the incremental rolling statistics'''
+import csv
+import io
+import numpy as np
+import rolling_statistics
+
+
+def test_against_numpy():
+    '''Check the rolling statistics and trend against np.mean, np.var and np.polyfit'''
+    rng = np.random.default_rng(0)
+    t = np.arange(1850, 1950, dtype=float)
+    x = 0.01 * (t - 1850) + rng.standard_normal(len(t))
+    window = 10
+    stats = rolling_statistics.RollingStatistics(window=window, alpha=0.2)
+    result = list(stats.process([t[k], x[k]] for k in range(len(t))))
+    assert len(result) == len(t)
+    for k in [1, 5, 9, 10, 50, len(t) - 1]:
+        w = x[max(0, k + 1 - window):k + 1]
+        s = result[k]
+        assert np.isclose(s.mean, np.mean(w))
+        assert np.isclose(s.variance, np.var(w, ddof=1))
+        assert (s.min, s.max) == (np.min(w), np.max(w))
+        slope, intercept = np.polyfit(t[:k + 1], x[:k + 1], 1)
+        assert np.isclose(s.trend_slope, slope)
+        assert np.isclose(s.trend_intercept, intercept)
+
+
+def test_skips_blank_and_header_rows():
+    '''Check that a header row, blank lines and short rows are skipped'''
+    text = 'Time,A\n1850,0.1\n\n1851,0.2\n1852\n'
+    stats = rolling_statistics.RollingStatistics(window=3)
+    result = list(stats.process(csv.reader(io.StringIO(text))))
+    assert [s.time for s in result] == [1850, 1851]
+    assert np.isclose(result[-1].mean, 0.15)